@@ -7,15 +7,269 @@ Forces extreme variation to prevent repetitive beats
 import random
 import math
 import hashlib
+import functools
 try:
     import numpy as np
     HAS_NUMPY = True
 except ImportError:
     HAS_NUMPY = False
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 from typing import List, Dict, Any, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 import json
+from collections import OrderedDict
+
+
+# Markov chain transition table: probability of a hit given the previous two
+# steps, indexed by (step[-2] << 1) | step[-1]
+MARKOV_HIT_PROBABILITY = (
+    0.3,  # After two 0s
+    0.6,  # After 0 then 1
+    0.7,  # After 1 then 0
+    0.2,  # After two 1s
+)
+
+
+# Maximum number of pattern identities remembered for uniqueness checks
+PATTERN_CACHE_SIZE = 65536
+
+# Fixed-point scales for the int8 velocity (0..1) and timing (-0.2..0.2) genes
+VELOCITY_SCALE = 127
+TIMING_SCALE = 127 / 0.2
+
+
+def _quantize(values, scale: float):
+    """Encode gene values as int8 fixed point"""
+    return np.rint(values * scale).astype(np.int8)
+
+
+def _lorenz_z(seed, n, sigma, rho, beta, dt):
+    """Integrate the Lorenz system from (seed, 2*seed, 3*seed), returning n z-values"""
+    values = np.empty(n)
+    x, y, z = seed, seed * 2, seed * 3
+    for k in range(n):
+        dx = sigma * (y - x) * dt
+        dy = (x * (rho - z) - y) * dt
+        dz = (x * y - beta * z) * dt
+        x += dx
+        y += dy
+        z += dz
+        values[k] = z
+    return values
+
+
+def _rhythm_fitness(row):
+    """Scalar fitness of one rhythm row; same terms as GeneticRhythm.fitness"""
+    length = len(row)
+    score = 0.0
+    
+    # Groove factor - consistent spacing
+    prev = -1
+    n = 0
+    total = 0.0
+    total_sq = 0.0
+    hits = 0
+    for i in range(length):
+        if row[i] == 1:
+            hits += 1
+            if prev >= 0:
+                spacing = i - prev
+                total += spacing
+                total_sq += spacing * spacing
+                n += 1
+            prev = i
+    if n > 0:
+        mean = total / n
+        variance = max(total_sq / n - mean * mean, 0.0)
+        score += 2.0 / (1.0 + math.sqrt(variance))
+    
+    # Density factor - not too sparse or dense
+    score += 1.0 - abs(hits / length - 0.4)
+    
+    # Syncopation factor
+    syncopation = 0
+    for i in range(1, length, 2):
+        if row[i] == 1:
+            syncopation += 1
+    score += syncopation / length * 2
+    
+    # Avoid repetitive patterns (non-overlapping repeats of the opening cell)
+    for size in (2, 4):
+        if size < length:
+            repeats = 0
+            j = 0
+            while j <= length - size:
+                match = True
+                for k in range(size):
+                    if row[j + k] != row[k]:
+                        match = False
+                        break
+                if match:
+                    repeats += 1
+                    j += size
+                else:
+                    j += 1
+            if repeats > length // size - 1:
+                score -= 1
+    
+    return max(0.0, score)
+
+
+def _run_ga(rhythm, velocity, timing, rates, generations, crossover_points, seed):
+    """Evolve the gene matrices in place for several generations.
+    
+    Survivors are written back best-first, so row 0 ends up holding the
+    best individual of the last generation scored."""
+    np.random.seed(seed)
+    size, length = rhythm.shape
+    half = size // 2
+    n_points = min(crossover_points, length - 1)
+    scores = np.empty(size)
+    
+    for _ in range(generations):
+        for p in range(size):
+            scores[p] = _rhythm_fitness(rhythm[p])
+        survivors = np.argsort(-scores)[:half]
+        
+        parent_rhythm = rhythm[survivors].copy()
+        parent_velocity = velocity[survivors].copy()
+        parent_timing = timing[survivors].copy()
+        parent_rates = rates[survivors].copy()
+        rhythm[:half] = parent_rhythm
+        velocity[:half] = parent_velocity
+        timing[:half] = parent_timing
+        rates[:half] = parent_rates
+        
+        for child in range(half, size):
+            a = np.random.randint(0, half)
+            b = np.random.randint(0, half)
+            points = np.random.permutation(length - 1)[:n_points] + 1
+            
+            # Multi-point crossover
+            for j in range(length):
+                crossed = 0
+                for point in points:
+                    if j >= point:
+                        crossed += 1
+                src = b if crossed % 2 == 1 else a
+                rhythm[child, j] = parent_rhythm[src, j]
+                velocity[child, j] = parent_velocity[src, j]
+                timing[child, j] = parent_timing[src, j]
+            rate = (parent_rates[a] + parent_rates[b]) / 2
+            rates[child] = rate
+            
+            # Mutation
+            for j in range(length):
+                if np.random.random() < rate:
+                    kind = np.random.randint(0, 4)
+                    if kind == 0:
+                        rhythm[child, j] = 1 - rhythm[child, j]
+                    elif kind == 1 and j > 0:
+                        held = rhythm[child, j]
+                        rhythm[child, j] = rhythm[child, j - 1]
+                        rhythm[child, j - 1] = held
+                    elif kind == 2:
+                        velocity[child, j] = round(np.random.uniform(0.3, 1.0) * VELOCITY_SCALE)
+                    elif kind == 3:
+                        timing[child, j] = round(np.random.uniform(-0.2, 0.2) * TIMING_SCALE)
+
+
+if HAS_NUMPY and HAS_NUMBA:
+    _lorenz_z = njit(cache=True)(_lorenz_z)
+    _rhythm_fitness = njit(cache=True, fastmath=True)(_rhythm_fitness)
+    _run_ga = njit(cache=True, fastmath=True)(_run_ga)
+
+
+def _to_bits(pattern: List[int]) -> int:
+    """Pack a binary pattern into an int, first step in the most significant bit"""
+    bits = 0
+    for hit in pattern:
+        bits = (bits << 1) | hit
+    return bits
+
+
+def _from_bits(bits: int, length: int) -> List[int]:
+    """Unpack an int produced by _to_bits back into a pattern of given length"""
+    return [(bits >> (length - 1 - i)) & 1 for i in range(length)]
+
+
+@functools.lru_cache(maxsize=32)
+def _fib_positions(length: int) -> Tuple[int, ...]:
+    """Fibonacci numbers below length, i.e. the hit steps of a Fibonacci pattern"""
+    fib = [1, 1]
+    while fib[-1] < length:
+        fib.append(fib[-1] + fib[-2])
+    return tuple(sorted({f for f in fib if f < length}))
+
+
+def _frozen(array):
+    """Mark a cached array read-only so callers cannot corrupt the cache"""
+    array.flags.writeable = False
+    return array
+
+
+@functools.lru_cache(maxsize=16)
+def _sine_gain(cols: int):
+    """Per-column gain of the probability-field sine transform"""
+    return _frozen((np.sin(np.arange(cols) * np.pi / 8) + 1) / 2)
+
+
+@functools.lru_cache(maxsize=16)
+def _exp_decay(cols: int):
+    """Per-column gain of the probability-field exponential transform"""
+    return _frozen(np.exp(-np.arange(cols) / cols * 3))
+
+
+@functools.lru_cache(maxsize=16)
+def _perlin_noise(rows: int, cols: int, scale: float = 4.0):
+    """Noise grid added by the probability-field Perlin-like transform"""
+    ii, jj = np.indices((rows, cols))
+    return _frozen(np.sin(ii * scale) * np.cos(jj * scale / 2))
+
+
+@functools.lru_cache(maxsize=16)
+def _spiral_gain(rows: int, cols: int):
+    """Gain grid of the probability-field spiral transform"""
+    ii, jj = np.indices((rows, cols))
+    dy, dx = ii - rows // 2, jj - cols // 2
+    return _frozen((np.sin(np.hypot(dy, dx) / 2 + np.arctan2(dy, dx) * 2) + 1) / 2)
+
+
+@functools.lru_cache(maxsize=16)
+def _wave_threshold(length: int):
+    """Moving threshold of the wave-interference generator"""
+    return _frozen(np.sin(np.arange(length) * 0.5) * 0.3)
+
+
+@functools.lru_cache(maxsize=16)
+def _phi_positions(length: int, n_hits: int):
+    """Hit steps of the golden-ratio generator"""
+    phi = (1 + math.sqrt(5)) / 2
+    positions = (np.arange(1, n_hits + 1) * (phi * length / 2)) % length
+    return _frozen(positions.astype(np.int64))
+
+
+@functools.lru_cache(maxsize=16)
+def _ca_rule_lut(rule: int):
+    """Next-cell lookup table of an elementary cellular automaton rule"""
+    return _frozen(np.array([(rule >> pos) & 1 for pos in range(8)], dtype=np.uint8))
+
+
+@functools.lru_cache(maxsize=16)
+def _odd_steps_mask(length: int) -> int:
+    """Bitmask selecting the odd steps of a pattern packed by _to_bits"""
+    return int('01' * (length // 2) + '0' * (length % 2), 2)
+
+
+def _pattern_key(pattern: List[int]) -> int:
+    """Identity of a pattern for the uniqueness cache; a leading sentinel bit
+    keeps patterns of different lengths apart"""
+    return (1 << len(pattern)) | _to_bits(pattern)
 
 
 class PatternAlgorithm(Enum):
@@ -59,43 +313,22 @@ class EuclideanRhythm:
         if pulses == 0:
             return [0] * steps
         
-        # Bjorklund's algorithm
-        pattern = []
-        counts = []
-        remainders = []
-        
-        divisor = steps - pulses
-        remainders.append(pulses)
-        level = 0
-        
-        while True:
-            counts.append(divisor // remainders[level])
-            remainders.append(divisor % remainders[level])
-            divisor = remainders[level]
-            level += 1
-            if remainders[level] <= 1:
-                break
-        
-        counts.append(divisor)
-        
-        def build(level):
-            if level == -1:
-                pattern.append(0)
-            elif level == -2:
-                pattern.append(1)
-            else:
-                for _ in range(counts[level]):
-                    build(level - 1)
-                if remainders[level] != 0:
-                    build(level - 2)
+        # Bresenham-style construction: equivalent to Bjorklund's algorithm
+        # up to rotation, without recursion or intermediate count lists
+        if HAS_NUMPY:
+            pattern = (np.arange(steps) * pulses) % steps < pulses
+            if rotation:
+                pattern = np.roll(pattern, -rotation)
+            return pattern.astype(np.int8).tolist()
         
-        build(level)
+        pattern = [1 if (i * pulses) % steps < pulses else 0 for i in range(steps)]
         
         # Apply rotation
         if rotation:
+            rotation %= steps
             pattern = pattern[rotation:] + pattern[:rotation]
         
-        return pattern[:steps]
+        return pattern
 
 
 class ChaosGenerator:
@@ -110,13 +343,13 @@ class ChaosGenerator:
         Generate pattern using logistic map (chaos equation)
         r: chaos parameter (3.57-4.0 for chaos)
         """
-        pattern = []
+        pattern = [0] * iterations
         x = self.state
         
-        for _ in range(iterations):
+        for i in range(iterations):
             x = r * x * (1 - x)
             # Convert to binary based on threshold
-            pattern.append(1 if x > 0.5 else 0)
+            pattern[i] = 1 if x > 0.5 else 0
             
         self.state = x  # Save state for next generation
         return pattern
@@ -127,14 +360,19 @@ class ChaosGenerator:
         sigma = 10.0
         rho = 28.0
         beta = 8.0 / 3.0
+        dt = 0.01
+        
+        if HAS_NUMPY:
+            # Oversample, then use z coordinate at regular intervals for rhythm
+            values = np.abs(_lorenz_z(self.seed, length * 10, sigma, rho, beta, dt))
+            return (values[::10][:length] > values.mean()).astype(np.int8).tolist()
         
         # Initial conditions
         x, y, z = self.seed, self.seed * 2, self.seed * 3
-        dt = 0.01
         
-        pattern = []
-        values = []
-        for _ in range(length * 10):  # Oversample
+        pattern = [0] * length
+        values = [0.0] * (length * 10)
+        for k in range(length * 10):  # Oversample
             dx = sigma * (y - x) * dt
             dy = (x * (rho - z) - y) * dt
             dz = (x * y - beta * z) * dt
@@ -142,14 +380,14 @@ class ChaosGenerator:
             x += dx
             y += dy
             z += dz
-            values.append(z)
+            values[k] = z
         
         # Sample at regular intervals
         threshold = sum(abs(v) for v in values) / len(values)
         for i in range(length):
             sample_point = i * 10
             # Use z coordinate for rhythm
-            pattern.append(1 if abs(values[sample_point]) > threshold else 0)
+            pattern[i] = 1 if abs(values[sample_point]) > threshold else 0
         
         return pattern
 
@@ -159,11 +397,12 @@ class ProbabilityField:
     
     def __init__(self):
         self.field = None
+        self.rng = np.random.default_rng() if HAS_NUMPY else None
     
     def generate_field(self, width: int, height: int = 4):
         """Generate 2D probability field"""
         if HAS_NUMPY:
-            field = np.random.random((height, width))
+            field = self.rng.random((height, width))
         else:
             field = [[random.random() for _ in range(width)] for _ in range(height)]
         
@@ -180,47 +419,46 @@ class ProbabilityField:
     def _sine_transform(self, field):
         """Apply sine wave transformation"""
         if HAS_NUMPY:
-            rows, cols = field.shape
-        else:
-            rows, cols = len(field), len(field[0])
+            field *= _sine_gain(field.shape[1])
+            return field
+        rows, cols = len(field), len(field[0])
         for i in range(rows):
             for j in range(cols):
-                field[i, j] = (math.sin(j * math.pi / 8) + 1) / 2 * field[i, j]
+                field[i][j] = (math.sin(j * math.pi / 8) + 1) / 2 * field[i][j]
         return field
     
     def _exponential_transform(self, field):
         """Apply exponential decay/growth"""
         if HAS_NUMPY:
-            rows, cols = field.shape
-        else:
-            rows, cols = len(field), len(field[0])
+            field *= _exp_decay(field.shape[1])
+            return field
+        rows, cols = len(field), len(field[0])
         for j in range(cols):
             decay = math.exp(-j / cols * 3)
-            field[:, j] *= decay
+            for i in range(rows):
+                field[i][j] *= decay
         return field
     
     def _perlin_noise_transform(self, field):
         """Simplified Perlin-like noise"""
-        if HAS_NUMPY:
-            rows, cols = field.shape
-        else:
-            rows, cols = len(field), len(field[0])
         scale = 4.0
+        if HAS_NUMPY:
+            field += _perlin_noise(*field.shape, scale)
+            field /= 2
+            return field
+        rows, cols = len(field), len(field[0])
         for i in range(rows):
             for j in range(cols):
                 noise = math.sin(i * scale) * math.cos(j * scale / 2)
-                if HAS_NUMPY:
-                    field[i, j] = (field[i, j] + noise) / 2
-                else:
-                    field[i][j] = max(0, min(1, (field[i][j] + noise) / 2))
+                field[i][j] = max(0, min(1, (field[i][j] + noise) / 2))
         return field
     
     def _spiral_transform(self, field):
         """Apply spiral transformation"""
         if HAS_NUMPY:
-            rows, cols = field.shape
-        else:
-            rows, cols = len(field), len(field[0])
+            field *= _spiral_gain(*field.shape)
+            return field
+        rows, cols = len(field), len(field[0])
         center_x, center_y = cols // 2, rows // 2
         
         for i in range(rows):
@@ -228,10 +466,7 @@ class ProbabilityField:
                 dist = math.sqrt((i - center_y)**2 + (j - center_x)**2)
                 angle = math.atan2(i - center_y, j - center_x)
                 spiral = (math.sin(dist / 2 + angle * 2) + 1) / 2
-                if HAS_NUMPY:
-                    field[i, j] = field[i, j] * spiral
-                else:
-                    field[i][j] = field[i][j] * spiral
+                field[i][j] = field[i][j] * spiral
         
         return field
     
@@ -240,16 +475,12 @@ class ProbabilityField:
         if threshold is None:
             threshold = random.uniform(0.3, 0.7)
         
-        pattern = []
         if HAS_NUMPY:
             track_data = field[track % field.shape[0]]
-        else:
-            track_data = field[track % len(field)]
+            return (track_data > threshold).astype(np.int8).tolist()
         
-        for prob in track_data:
-            pattern.append(1 if prob > threshold else 0)
-        
-        return pattern
+        track_data = field[track % len(field)]
+        return [1 if prob > threshold else 0 for prob in track_data]
 
 
 class GeneticRhythm:
@@ -259,9 +490,27 @@ class GeneticRhythm:
         self.population_size = population_size
         self.population = []
         self.generation = 0
+        # With NumPy the population is held as parallel (population, length)
+        # gene matrices instead of a list of PatternDNA; velocity and timing
+        # genes are stored as int8 fixed point (see VELOCITY_SCALE/TIMING_SCALE)
+        self.rhythm = None
+        self.velocity = None
+        self.timing = None
+        self.mutation_rates = None
+        self.rng = np.random.default_rng() if HAS_NUMPY else None
     
     def initialize_population(self, length: int = 16):
         """Create initial random population"""
+        if HAS_NUMPY:
+            size = self.population_size
+            # Random patterns with varying density
+            density = self.rng.uniform(0.1, 0.8, (size, 1))
+            self.rhythm = (self.rng.random((size, length)) < density).astype(np.int8)
+            self.velocity = _quantize(self.rng.uniform(0.5, 1.0, (size, length)), VELOCITY_SCALE)
+            self.timing = _quantize(self.rng.uniform(-0.1, 0.1, (size, length)), TIMING_SCALE)
+            self.mutation_rates = np.full(size, PatternDNA.mutation_rate)
+            return
+        
         self.population = []
         for _ in range(self.population_size):
             # Random pattern with varying density
@@ -273,6 +522,15 @@ class GeneticRhythm:
                 timing_genes=[random.uniform(-0.1, 0.1) for _ in range(length)]
             ))
     
+    def _to_pattern_dna(self, index: int) -> PatternDNA:
+        """Materialize one individual of the gene matrices as PatternDNA"""
+        return PatternDNA(
+            rhythm_genes=self.rhythm[index].tolist(),
+            velocity_genes=(self.velocity[index] / VELOCITY_SCALE).tolist(),
+            timing_genes=(self.timing[index] / TIMING_SCALE).tolist(),
+            mutation_rate=float(self.mutation_rates[index])
+        )
+    
     def fitness(self, dna: PatternDNA) -> float:
         """Calculate fitness score for pattern"""
         pattern = dna.rhythm_genes
@@ -304,16 +562,69 @@ class GeneticRhythm:
         syncopation = sum(1 for i in range(1, len(pattern), 2) if pattern[i] == 1)
         score += syncopation / len(pattern) * 2
         
-        # Avoid repetitive patterns
-        pattern_str = ''.join(map(str, pattern))
+        # Avoid repetitive patterns (non-overlapping repeats of the opening cell)
+        length = len(pattern)
+        bits = _to_bits(pattern)
         for size in [2, 4]:
-            if size < len(pattern):
-                substring = pattern_str[:size]
-                if pattern_str.count(substring) > len(pattern) // size - 1:
+            if size < length:
+                mask = (1 << size) - 1
+                head = bits >> (length - size)
+                repeats = 0
+                shift = length - size
+                while shift >= 0:
+                    if (bits >> shift) & mask == head:
+                        repeats += 1
+                        shift -= size
+                    else:
+                        shift -= 1
+                if repeats > length // size - 1:
                     score -= 1  # Penalty for repetition
         
         return max(0, score)
     
+    @staticmethod
+    def fitness_batch(rhythms) -> "np.ndarray":
+        """Calculate fitness scores for a (population, length) rhythm matrix at once"""
+        pop = np.asarray(rhythms, dtype=np.int8) == 1
+        size_p, length = pop.shape
+        steps = np.arange(length)
+        scores = np.zeros(size_p)
+        
+        # Groove factor - consistent spacing between consecutive hits
+        last_hit = np.maximum.accumulate(np.where(pop, steps, -1), axis=1)
+        prev_hit = np.empty_like(last_hit)
+        prev_hit[:, 0] = -1
+        prev_hit[:, 1:] = last_hit[:, :-1]
+        has_prev = pop & (prev_hit >= 0)
+        spacings = np.where(has_prev, steps - prev_hit, 0)
+        n_spacings = has_prev.sum(axis=1)
+        grooved = n_spacings > 0
+        n = n_spacings[grooved]
+        mean = spacings.sum(axis=1)[grooved] / n
+        variance = (spacings ** 2).sum(axis=1)[grooved] / n - mean ** 2
+        scores[grooved] += 2.0 / (1.0 + np.sqrt(np.maximum(variance, 0.0)))
+        
+        # Density factor - not too sparse or dense
+        ideal_density = 0.4
+        scores += 1.0 - np.abs(pop.mean(axis=1) - ideal_density)
+        
+        # Syncopation factor
+        scores += pop[:, 1::2].sum(axis=1) / length * 2
+        
+        # Avoid repetitive patterns (non-overlapping repeats of the opening cell)
+        for size in (2, 4):
+            if size < length:
+                head = pop[:, :size]
+                repeats = np.zeros(size_p, dtype=np.int64)
+                next_free = np.zeros(size_p, dtype=np.int64)
+                for j in range(length - size + 1):
+                    match = (pop[:, j:j + size] == head).all(axis=1) & (next_free <= j)
+                    repeats += match
+                    next_free[match] = j + size
+                scores[repeats > length // size - 1] -= 1
+        
+        return np.maximum(scores, 0.0)
+    
     def crossover(self, parent1: PatternDNA, parent2: PatternDNA) -> PatternDNA:
         """Create offspring from two parents"""
         length = len(parent1.rhythm_genes)
@@ -374,8 +685,93 @@ class GeneticRhythm:
         
         return mutated
     
+    def _crossover_batch(self, parents1: "np.ndarray", parents2: "np.ndarray"):
+        """Create one offspring per parent pair as rows of new gene matrices"""
+        children = len(parents1)
+        length = self.rhythm.shape[1]
+        n_points = min(PatternDNA.crossover_points, length - 1)
+        
+        # Distinct crossover points per child; a step comes from the second
+        # parent when an odd number of points lie at or before it
+        points = self.rng.random((children, length - 1)).argsort(axis=1)[:, :n_points] + 1
+        crossed = (np.arange(length) >= points[:, :, None]).sum(axis=1)
+        from_second = crossed % 2 == 1
+        
+        return (
+            np.where(from_second, self.rhythm[parents2], self.rhythm[parents1]),
+            np.where(from_second, self.velocity[parents2], self.velocity[parents1]),
+            np.where(from_second, self.timing[parents2], self.timing[parents1]),
+            (self.mutation_rates[parents1] + self.mutation_rates[parents2]) / 2
+        )
+    
+    def _mutate_batch(self, rhythm, velocity, timing, mutation_rates):
+        """Mutate gene matrices in place, one mutation draw per step"""
+        children, length = rhythm.shape
+        mutating = self.rng.random((children, length)) < mutation_rates[:, None]
+        kind = self.rng.integers(0, 4, (children, length))  # flip, shift, velocity, timing
+        
+        flip = mutating & (kind == 0)
+        rhythm[flip] = 1 - rhythm[flip]
+        
+        # Flips never follow a shift touching the same step, so applying all
+        # flips first and then the left-to-right swaps matches sequential order
+        shift = mutating & (kind == 1)
+        shift[:, 0] = False
+        for i in np.flatnonzero(shift.any(axis=0)):
+            rows = shift[:, i]
+            rhythm[rows, i - 1], rhythm[rows, i] = rhythm[rows, i], rhythm[rows, i - 1]
+        
+        new_velocity = mutating & (kind == 2)
+        velocity[new_velocity] = _quantize(
+            self.rng.uniform(0.3, 1.0, new_velocity.sum()), VELOCITY_SCALE)
+        new_timing = mutating & (kind == 3)
+        timing[new_timing] = _quantize(
+            self.rng.uniform(-0.2, 0.2, new_timing.sum()), TIMING_SCALE)
+    
+    def _evolve_batch(self) -> PatternDNA:
+        """Evolve the gene matrices one generation and return the best pattern"""
+        if self.rhythm is None:
+            self.initialize_population()
+        
+        # Select top performers; only the top half is needed, not a full ranking
+        scores = self.fitness_batch(self.rhythm)
+        half = self.population_size // 2
+        survivors = np.argpartition(-scores, half)[:half]
+        best = self._to_pattern_dna(survivors[np.argmax(scores[survivors])])
+        
+        # Create new generation
+        children = self.population_size - len(survivors)
+        rhythm, velocity, timing, rates = self._crossover_batch(
+            self.rng.choice(survivors, children), self.rng.choice(survivors, children))
+        self._mutate_batch(rhythm, velocity, timing, rates)
+        
+        self.rhythm = np.concatenate((self.rhythm[survivors], rhythm))
+        self.velocity = np.concatenate((self.velocity[survivors], velocity))
+        self.timing = np.concatenate((self.timing[survivors], timing))
+        self.mutation_rates = np.concatenate((self.mutation_rates[survivors], rates))
+        self.generation += 1
+        
+        return best
+    
+    def evolve_many(self, generations: int) -> PatternDNA:
+        """Evolve for several generations and return the last best pattern"""
+        if HAS_NUMPY and HAS_NUMBA:
+            if self.rhythm is None:
+                self.initialize_population()
+            _run_ga(self.rhythm, self.velocity, self.timing, self.mutation_rates,
+                    generations, PatternDNA.crossover_points, int(self.rng.integers(2**31)))
+            self.generation += generations
+            return self._to_pattern_dna(0)
+        
+        for _ in range(generations):
+            best = self.evolve()
+        return best
+    
     def evolve(self) -> PatternDNA:
         """Evolve population and return best pattern"""
+        if HAS_NUMPY:
+            return self._evolve_batch()
+        
         if not self.population:
             self.initialize_population()
         
@@ -412,8 +808,9 @@ class CreativePatternEngine:
         self.chaos = ChaosGenerator()
         self.probability = ProbabilityField()
         self.genetic = GeneticRhythm()
-        self.pattern_cache = set()
+        self.pattern_cache = OrderedDict()  # Bounded LRU set of pattern keys
         self.last_algorithm = None
+        self.rng = np.random.default_rng() if HAS_NUMPY else None
     
     def generate_unique_pattern(self, length: int = 16, 
                                force_different: bool = True) -> Dict[str, Any]:
@@ -450,25 +847,34 @@ class CreativePatternEngine:
             pattern = self._generate_golden_ratio(length)
         
         # Ensure uniqueness
-        pattern_hash = hashlib.md5(''.join(map(str, pattern)).encode()).hexdigest()
+        pattern_key = _pattern_key(pattern)
         
         attempts = 0
-        while pattern_hash in self.pattern_cache and attempts < 10:
+        while pattern_key in self.pattern_cache and attempts < 10:
             # Apply random transformation
             pattern = self._transform_pattern(pattern)
-            pattern_hash = hashlib.md5(''.join(map(str, pattern)).encode()).hexdigest()
+            pattern_key = _pattern_key(pattern)
             attempts += 1
         
-        self.pattern_cache.add(pattern_hash)
+        self._remember_pattern(pattern_key)
         
         return {
             'pattern': pattern,
             'algorithm': algorithm.value,
-            'hash': pattern_hash[:8],
+            'hash': f"{pattern_key:08x}"[-8:],
             'density': sum(pattern) / len(pattern),
             'syncopation': self._calculate_syncopation(pattern)
         }
     
+    def _remember_pattern(self, pattern_key: int):
+        """Record a pattern key, evicting the least recently seen past the cap"""
+        if pattern_key in self.pattern_cache:
+            self.pattern_cache.move_to_end(pattern_key)
+            return
+        self.pattern_cache[pattern_key] = None
+        if len(self.pattern_cache) > PATTERN_CACHE_SIZE:
+            self.pattern_cache.popitem(last=False)
+    
     def _generate_euclidean(self, length: int) -> List[int]:
         """Generate using Euclidean rhythm"""
         # Random but musical parameters
@@ -492,25 +898,17 @@ class CreativePatternEngine:
         """Generate using genetic evolution"""
         self.genetic.initialize_population(length)
         # Evolve for a few generations
-        for _ in range(random.randint(5, 20)):
-            best = self.genetic.evolve()
+        best = self.genetic.evolve_many(random.randint(5, 20))
         return [int(x) for x in best.rhythm_genes]
     
     def _generate_fibonacci(self, length: int) -> List[int]:
         """Generate pattern based on Fibonacci sequence"""
-        pattern = [0] * length
-        fib = [1, 1]
-        
-        while fib[-1] < length:
-            fib.append(fib[-1] + fib[-2])
-        
-        for f in fib:
-            if f < length:
-                pattern[f % length] = 1
-        
         # Add variation
         offset = random.randint(0, length - 1)
-        pattern = pattern[offset:] + pattern[:offset]
+        
+        pattern = [0] * length
+        for f in _fib_positions(length):
+            pattern[(f - offset) % length] = 1
         
         return pattern
     
@@ -518,13 +916,21 @@ class CreativePatternEngine:
         """Generate using cellular automaton (Rule 30, 90, etc.)"""
         rule = random.choice([30, 90, 110, 150])  # Interesting rules
         
-        # Initial state
-        state = [random.randint(0, 1) for _ in range(length)]
-        
         # Apply rule for several generations
         generations = random.randint(3, 8)
+        if HAS_NUMPY:
+            rule_lut = _ca_rule_lut(rule)
+            cells = self.rng.integers(0, 2, length, dtype=np.uint8)  # Initial state
+            for _ in range(generations):
+                pos = (np.roll(cells, 1) << 2) | (cells << 1) | np.roll(cells, -1)
+                cells = rule_lut[pos]
+            return cells.tolist()
+        
+        # Initial state, plus a second buffer swapped in each generation
+        state = [random.randint(0, 1) for _ in range(length)]
+        new_state = [0] * length
+        
         for _ in range(generations):
-            new_state = []
             for i in range(length):
                 left = state[(i - 1) % length]
                 center = state[i]
@@ -533,29 +939,30 @@ class CreativePatternEngine:
                 # Convert to binary position
                 pos = left * 4 + center * 2 + right
                 # Apply rule
-                new_state.append((rule >> pos) & 1)
+                new_state[i] = (rule >> pos) & 1
             
-            state = new_state
+            state, new_state = new_state, state
         
         return state
     
     def _generate_markov(self, length: int) -> List[int]:
         """Generate using Markov chain"""
-        # Transition matrix
-        transitions = {
-            (0, 0): [0.7, 0.3],  # After two 0s
-            (0, 1): [0.4, 0.6],  # After 0 then 1
-            (1, 0): [0.3, 0.7],  # After 1 then 0
-            (1, 1): [0.8, 0.2],  # After two 1s
-        }
+        pattern = [0] * max(length, 2)
+        pattern[0], pattern[1] = random.randint(0, 1), random.randint(0, 1)
         
-        pattern = [random.randint(0, 1), random.randint(0, 1)]
+        # Draw every step's uniform up front, then walk the chain with the
+        # last two steps packed into a 2-bit state indexing the LUT
+        steps = max(length - 2, 0)
+        if HAS_NUMPY:
+            draws = self.rng.random(steps).tolist()
+        else:
+            draws = [random.random() for _ in range(steps)]
         
-        for _ in range(length - 2):
-            prev_state = (pattern[-2], pattern[-1])
-            probs = transitions.get(prev_state, [0.5, 0.5])
-            next_val = 1 if random.random() < probs[1] else 0
-            pattern.append(next_val)
+        state = (pattern[0] << 1) | pattern[1]
+        for i, draw in enumerate(draws, 2):
+            next_val = 1 if draw < MARKOV_HIT_PROBABILITY[state] else 0
+            pattern[i] = next_val
+            state = ((state << 1) | next_val) & 3
         
         return pattern[:length]
     
@@ -576,13 +983,18 @@ class CreativePatternEngine:
     
     def _generate_wave(self, length: int) -> List[int]:
         """Generate using wave interference"""
-        pattern = []
-        
         # Generate multiple waves
         wave1_freq = random.uniform(0.5, 3)
         wave2_freq = random.uniform(0.3, 2)
         phase_offset = random.uniform(0, math.pi * 2)
         
+        if HAS_NUMPY:
+            i = np.arange(length)
+            combined = (np.sin(i * wave1_freq * np.pi / 8) +
+                        np.sin(i * wave2_freq * np.pi / 8 + phase_offset)) / 2
+            return (combined > _wave_threshold(length)).astype(np.int8).tolist()
+        
+        pattern = [0] * length
         for i in range(length):
             # Calculate wave interference
             wave1 = math.sin(i * wave1_freq * math.pi / 8)
@@ -592,17 +1004,23 @@ class CreativePatternEngine:
             
             # Convert to binary with variable threshold
             threshold = math.sin(i * 0.5) * 0.3  # Moving threshold
-            pattern.append(1 if combined > threshold else 0)
+            pattern[i] = 1 if combined > threshold else 0
         
         return pattern
     
     def _generate_golden_ratio(self, length: int) -> List[int]:
         """Generate pattern based on golden ratio"""
         phi = (1 + math.sqrt(5)) / 2
-        pattern = [0] * length
+        n_hits = int(length * 0.4)  # Fill ~40% with hits
+        
+        if HAS_NUMPY:
+            pattern = np.zeros(length, dtype=np.int8)
+            pattern[_phi_positions(length, n_hits)] = 1
+            return pattern.tolist()
         
+        pattern = [0] * length
         position = 0
-        for i in range(int(length * 0.4)):  # Fill ~40% with hits
+        for _ in range(n_hits):
             position = (position + phi * length / 2) % length
             pattern[int(position)] = 1
         
@@ -610,17 +1028,25 @@ class CreativePatternEngine:
     
     def _transform_pattern(self, pattern: List[int]) -> List[int]:
         """Apply random transformation to pattern"""
+        length = len(pattern)
+        mask = (1 << length) - 1
+        half = length // 2
+        odd_steps = _odd_steps_mask(length)
+        
+        def rotate(bits, n):
+            return ((bits << n) | (bits >> (length - n))) & mask
+        
         transformations = [
-            lambda p: p[::-1],  # Reverse
-            lambda p: [1 - x for x in p],  # Invert
-            lambda p: p[len(p)//2:] + p[:len(p)//2],  # Rotate half
-            lambda p: [p[i] if i % 2 == 0 else 1 - p[i] for i in range(len(p))],  # Invert odd positions
-            lambda p: [p[i] | p[(i+1) % len(p)] for i in range(len(p))],  # OR with next
-            lambda p: [p[i] & p[(i+1) % len(p)] for i in range(len(p))],  # AND with next
+            lambda b: int(f"{b:0{length}b}"[::-1], 2),  # Reverse
+            lambda b: ~b & mask,  # Invert
+            lambda b: rotate(b, half),  # Rotate half
+            lambda b: b ^ odd_steps,  # Invert odd positions
+            lambda b: b | rotate(b, 1),  # OR with next
+            lambda b: b & rotate(b, 1),  # AND with next
         ]
         
         transform = random.choice(transformations)
-        return transform(pattern)
+        return _from_bits(transform(_to_bits(pattern)), length)
     
     def _calculate_syncopation(self, pattern: List[int]) -> float:
         """Calculate syncopation level of pattern"""
@@ -641,6 +1067,9 @@ class CreativePatternEngine:
                                       relationship: str = 'interlocking') -> List[int]:
         """Generate a pattern that complements the base pattern"""
         
+        if HAS_NUMPY and relationship in ('interlocking', 'call_response', 'contrasting'):
+            return self._complementary_batch(base_pattern, relationship)
+        
         if relationship == 'interlocking':
             # Fill gaps in base pattern
             return [1 if base_pattern[i] == 0 and random.random() < 0.5 else 0 
@@ -671,6 +1100,24 @@ class CreativePatternEngine:
             return [1 if random.random() < target_density else 0 
                    for _ in range(len(base_pattern))]
     
+    def _complementary_batch(self, base_pattern: List[int], relationship: str) -> List[int]:
+        """NumPy version of the random complementary relationships"""
+        base = np.asarray(base_pattern, dtype=np.int8)
+        draws = self.rng.random(len(base))
+        
+        if relationship == 'interlocking':
+            # Fill gaps in base pattern
+            response = (base == 0) & (draws < 0.5)
+        elif relationship == 'call_response':
+            # Respond to base pattern
+            response = np.zeros(len(base), dtype=bool)
+            response[1:] = (base[:-1] == 1) & (draws[1:] < 0.6)
+        else:  # 'contrasting'
+            # Opposite density
+            response = draws < 1.0 - base.mean()
+        
+        return response.astype(np.int8).tolist()
+    
     def generate_drum_kit(self, length: int = 16) -> Dict[str, List[int]]:
         """Generate complete drum kit with related but unique patterns"""
         
@@ -678,23 +1125,44 @@ class CreativePatternEngine:
         kick_data = self.generate_unique_pattern(length)
         kick = kick_data['pattern']
         
-        # Generate related patterns
-        snare = self.generate_complementary_pattern(kick, 'interlocking')
-        
-        # Ensure snare has backbeat
-        snare[length//2] = 1  # Force snare on 2
-        if length >= 16:
-            snare[3*length//4] = 1  # Force snare on 4
-        
-        # Generate hi-hats with higher density
+        # Generate hi-hats from a second algorithm pass
         hat_pattern = self.generate_unique_pattern(length)['pattern']
-        # Increase hat density
-        for i in range(length):
-            if random.random() < 0.3:
-                hat_pattern[i] = 1
         
-        # Generate additional percussion
-        perc = self.generate_complementary_pattern(kick, 'polyrhythmic')
+        if HAS_NUMPY:
+            # Build snare, hat and perc together as rows of one kit matrix
+            kit = np.zeros((4, length), dtype=np.int8)
+            kit[0] = kick
+            draws = self.rng.random((2, length))
+            
+            # Snare interlocks with the kick and keeps its backbeat
+            kit[1] = (kit[0] == 0) & (draws[0] < 0.5)
+            kit[1, length//2] = 1  # Force snare on 2
+            if length >= 16:
+                kit[1, 3*length//4] = 1  # Force snare on 4
+            
+            # Increase hat density
+            kit[2] = np.asarray(hat_pattern, dtype=bool) | (draws[1] < 0.3)
+            
+            # Polyrhythmic percussion on a different cycle length
+            kit[3, ::random.choice([3, 5, 7])] = 1
+            
+            kick, snare, hat_pattern, perc = kit.tolist()
+        else:
+            # Generate related patterns
+            snare = self.generate_complementary_pattern(kick, 'interlocking')
+            
+            # Ensure snare has backbeat
+            snare[length//2] = 1  # Force snare on 2
+            if length >= 16:
+                snare[3*length//4] = 1  # Force snare on 4
+            
+            # Increase hat density
+            for i in range(length):
+                if random.random() < 0.3:
+                    hat_pattern[i] = 1
+            
+            # Generate additional percussion
+            perc = self.generate_complementary_pattern(kick, 'polyrhythmic')
         
         return {
             'kick': kick,
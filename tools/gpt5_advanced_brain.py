@@ -10,10 +10,15 @@ import json
 import time
 import hashlib
 import random
-from typing import Dict, List, Any, Optional, Tuple
+import re
+import struct
+from typing import Dict, List, Any, Mapping, Optional, Set, Tuple
 from dataclasses import dataclass, field
+from functools import lru_cache
 from enum import Enum
-from collections import deque
+from types import MappingProxyType
+from collections import OrderedDict, deque
+from itertools import islice
 from datetime import datetime
 
 # Import base components
@@ -27,6 +32,142 @@ try:
 except ImportError:
     HAS_OPENAI = False
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+# Pattern hashes are 16 hex digits, compared bitwise for similarity
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+SEED_STRUCT = struct.Struct('<QI')  # (pattern hash, creation count) hashed into a variation seed
+FINGERPRINT_PRIME = 0x100000001B3  # 64-bit FNV prime, mixes fields into a plan fingerprint
+
+# Bloom filter over every remembered pattern hash: 2**16 bits, 3 probes taken
+# from the top bits of multiplicative hashes
+BLOOM_BITS = 1 << 16
+BLOOM_SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9)
+
+
+@lru_cache(maxsize=256)
+def _identity_digest(key: Optional[str], genre: Optional[str]) -> int:
+    """64-bit digest of a plan's key and genre, the same in every process"""
+    return int.from_bytes(hashlib.blake2b(f"{key}|{genre}".encode(), digest_size=8).digest(), 'big')
+
+
+if hasattr(int, 'bit_count'):
+    _popcount = int.bit_count
+else:
+    # int.bit_count is new in Python 3.10
+    def _popcount(value: int) -> int:
+        """Number of set bits in a non-negative int"""
+        return bin(value).count('1')
+
+
+def _bloom_probes(pattern_hash: int):
+    """Bit positions of a hash in the creative-memory Bloom filter"""
+    for seed in BLOOM_SEEDS:
+        yield ((pattern_hash * seed) & HASH_MASK) >> (HASH_BITS - 16)
+
+
+# Most rhythm hashes remembered before the oldest are forgotten
+RHYTHM_HASH_LIMIT = 10_000
+
+# Rhythm mutation strategies, drawn by index
+MUTATIONS = ('flip', 'shift', 'double', 'remove')
+
+
+
+def _mutate_candidates(candidates, base, draws, strategies, rate, hashes):
+    """Mutate every row of candidates from base and pack each into hashes.
+    
+    draws and strategies hold one pre-drawn random value per step; the
+    strategy codes index MUTATIONS and are applied in step order, exactly
+    like PatternGenerator._apply_mutation."""
+    n, length = candidates.shape
+    for row in range(n):
+        hits = 0
+        for i in range(length):
+            candidates[row, i] = base[i]
+        for i in range(length):
+            if draws[row, i] < rate:
+                kind = strategies[row, i]
+                if kind == 0:
+                    candidates[row, i] = 1 - candidates[row, i]
+                elif kind == 1 and i > 0:
+                    held = candidates[row, i]
+                    candidates[row, i] = candidates[row, i - 1]
+                    candidates[row, i - 1] = held
+                elif kind == 2 and i < length - 1:
+                    candidates[row, i + 1] = candidates[row, i]
+                elif kind == 3:
+                    candidates[row, i] = 0
+        
+        # Ensure pattern isn't empty, then pack step i into bit i
+        packed = 0
+        for i in range(length):
+            hits += candidates[row, i]
+            packed |= np.int64(candidates[row, i]) << i
+        if hits == 0:
+            candidates[row, 0] = 1
+            packed = 1
+        hashes[row] = packed
+
+
+if HAS_NUMPY and HAS_NUMBA:
+    _mutate_candidates = njit(cache=True)(_mutate_candidates)
+
+
+# Base drum patterns per genre and element, mutated into unique rhythms
+BASE_PATTERNS = {
+    'house': {
+        'kick': (1,0,0,0,1,0,0,0,1,0,0,0,1,0,0,0),
+        'snare': (0,0,0,0,1,0,0,0,0,0,0,0,1,0,0,0),
+        'hat': (0,0,1,0,0,0,1,0,0,0,1,0,0,0,1,0)
+    },
+    'techno': {
+        'kick': (1,0,0,1,1,0,0,0,1,0,0,1,1,0,0,0),
+        'snare': (0,0,0,0,1,0,0,1,0,0,0,0,1,0,0,1),
+        'hat': (1,1,0,1,1,1,0,1,1,1,0,1,1,1,0,1)
+    },
+    'dnb': {
+        'kick': (1,0,0,0,0,0,1,0,0,1,0,0,0,0,0,0),
+        'snare': (0,0,0,0,1,0,0,0,0,0,0,0,1,0,0,0),
+        'hat': (1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1)
+    },
+    'dubstep': {
+        'kick': (1,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0),
+        'snare': (0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0),
+        'hat': (0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0)
+    }
+}
+DEFAULT_BASE_PATTERN = (1,0,0,0,1,0,0,0,1,0,0,0,1,0,0,0)
+
+# Hit density per genre and element for fully random rhythms
+PATTERN_DENSITIES = {
+    'house': {'kick': 0.25, 'snare': 0.125, 'hat': 0.25},
+    'techno': {'kick': 0.3, 'snare': 0.15, 'hat': 0.5},
+    'dnb': {'kick': 0.2, 'snare': 0.125, 'hat': 0.7},
+    'dubstep': {'kick': 0.125, 'snare': 0.0625, 'hat': 0.1},
+    'trap': {'kick': 0.15, 'snare': 0.1, 'hat': 0.6}
+}
+
+# Candidate rhythms mutated and checked for uniqueness per batch
+CANDIDATE_BATCH = 32
+
+# Mutation rate ceiling for one rhythm search, and how many more candidates
+# are tried once it is reached before falling back to a random pattern
+MAX_MUTATION_RATE = 0.5
+SATURATED_ATTEMPTS = 8
+
 
 class GPTMode(Enum):
     """Different GPT-5 operation modes for various tasks"""
@@ -38,52 +179,278 @@ class GPTMode(Enum):
     ANALYTICAL = "gpt-5-analytical"   # Technical analysis mode
 
 
+# Mode selection keywords in priority order: (mode, single words, phrases)
+MODE_KEYWORDS = (
+    (GPTMode.FAST, frozenset({'quick', 'simple', 'fast', 'basic'}), ()),
+    (GPTMode.RESEARCH, frozenset({'like'}), ('style of', 'similar to', 'inspired by')),
+    (GPTMode.CREATIVE, frozenset({'experimental', 'unique', 'creative', 'unusual'}), ()),
+    (GPTMode.ANALYTICAL, frozenset({'analyze', 'technical', 'detailed', 'specific'}), ()),
+    (GPTMode.DEEP_THINKING, frozenset({'complex', 'intricate', 'sophisticated'}), ()),
+)
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Model parameters per mode (read-only, shared by every request)
+MODEL_CONFIGS = MappingProxyType({
+    GPTMode.FAST: MappingProxyType({
+        'model': 'gpt-3.5-turbo',  # Simulated GPT-5 fast
+        'temperature': 0.3,
+        'max_tokens': 500,
+        'presence_penalty': 0.0,
+        'frequency_penalty': 0.0
+    }),
+    GPTMode.BALANCED: MappingProxyType({
+        'model': 'gpt-4',  # Simulated GPT-5 balanced
+        'temperature': 0.7,
+        'max_tokens': 1500,
+        'presence_penalty': 0.3,
+        'frequency_penalty': 0.3
+    }),
+    GPTMode.DEEP_THINKING: MappingProxyType({
+        'model': 'gpt-4-turbo-preview',  # Simulated GPT-5 deep
+        'temperature': 0.6,
+        'max_tokens': 3000,
+        'presence_penalty': 0.5,
+        'frequency_penalty': 0.5
+    }),
+    GPTMode.RESEARCH: MappingProxyType({
+        'model': 'gpt-4-turbo-preview',  # Simulated GPT-5 research
+        'temperature': 0.4,
+        'max_tokens': 4000,
+        'presence_penalty': 0.2,
+        'frequency_penalty': 0.4
+    }),
+    GPTMode.CREATIVE: MappingProxyType({
+        'model': 'gpt-4',  # Simulated GPT-5 creative
+        'temperature': 0.9,
+        'max_tokens': 2000,
+        'presence_penalty': 0.7,
+        'frequency_penalty': 0.7
+    }),
+    GPTMode.ANALYTICAL: MappingProxyType({
+        'model': 'gpt-4',  # Simulated GPT-5 analytical
+        'temperature': 0.2,
+        'max_tokens': 2500,
+        'presence_penalty': 0.1,
+        'frequency_penalty': 0.1
+    })
+})
+
+# System message per mode
+SYSTEM_MESSAGES = {
+    GPTMode.FAST: "You are a quick music assistant. Provide fast, practical solutions.",
+    
+    GPTMode.BALANCED: """You are an expert music producer. Balance creativity with technical accuracy.
+    Focus on creating unique patterns that don't repeat previous creations.""",
+    
+    GPTMode.DEEP_THINKING: """You are a master music producer and theorist. Think deeply about:
+    - The emotional impact of each musical choice
+    - How different elements interact harmonically and rhythmically
+    - Creating completely unique patterns and progressions
+    - Avoiding any repetition from previous works""",
+    
+    GPTMode.RESEARCH: """You are a music research AI that deeply analyzes artist styles.
+    Extract the DNA of the requested style including:
+    - Signature rhythm patterns and groove
+    - Unique production techniques
+    - Harmonic and melodic tendencies
+    - Mix and mastering approach
+    Create variations that capture the essence while being original.""",
+    
+    GPTMode.CREATIVE: """You are an experimental music AI. Your goal is to:
+    - Create never-before-heard patterns and combinations
+    - Push boundaries while maintaining musicality
+    - Combine unexpected elements that work together
+    - Generate multiple wildly different variations""",
+    
+    GPTMode.ANALYTICAL: """You are a technical music analysis AI. Focus on:
+    - Precise technical specifications
+    - Frequency analysis and sonic characteristics
+    - Detailed production chain recommendations
+    - Mathematical relationships in rhythm and harmony"""
+}
+
+
+# Summary of previous creations, embedded in every prompt
+MEMORY_CONTEXT_TEMPLATE = """
+    Previous creations to AVOID repeating:
+    - Last tempo: {last_tempo}
+    - Last key: {last_key}
+    - Last genre: {last_genre}
+    - Patterns used: {pattern_count} unique patterns
+    - Creation number: {creation_number}
+    
+    IMPORTANT: Generate completely NEW and DIFFERENT patterns!
+    """
+
+# Sound combinations suggested by the creative prompt
+SOUND_SOURCES = ('organic', 'digital', 'found')
+SOUND_TEXTURES = ('synthetic', 'acoustic', 'processed')
+
+# Prompt template per mode, filled in with str.format at request time
+PROMPT_TEMPLATES = {
+    GPTMode.RESEARCH: """
+    Deep style research for: "{request}"
+    
+    {memory_context}
+    
+    Analyze and extract:
+    1. Rhythm DNA (specific patterns, not generic)
+    2. Harmonic DNA (exact progressions and voicings)
+    3. Production DNA (specific techniques and effects)
+    4. Signature elements that define this style
+    5. Generate 5 DIFFERENT variations that capture the essence
+    
+    Return JSON with detailed analysis and multiple unique options.
+    """,
+    
+    GPTMode.CREATIVE: """
+    Maximum creativity for: "{request}"
+    
+    {memory_context}
+    
+    Generate something completely unique:
+    1. Invent NEW rhythm patterns (not standard patterns)
+    2. Create unexpected harmonic progressions
+    3. Combine {source} with {texture} sounds
+    4. Generate {variations} wildly different variations
+    
+    Randomization seed: {seed}
+    
+    Return JSON with multiple innovative options.
+    """,
+    
+    GPTMode.DEEP_THINKING: """
+    Deep analysis for: "{request}"
+    
+    {memory_context}
+    
+    Consider deeply:
+    1. Emotional journey and dynamics
+    2. Tension and release patterns
+    3. Frequency spectrum utilization
+    4. Groove and pocket placement
+    5. Generate {variations} sophisticated variations
+    
+    Each variation must be significantly different from others.
+    
+    Return comprehensive JSON with detailed variations.
+    """
+}
+
+# Default prompt with anti-repetition emphasis
+DEFAULT_PROMPT_TEMPLATE = """
+    Analyze: "{request}"
+    
+    {memory_context}
+    
+    Create unique music with:
+    - Fresh patterns different from the last {creation_count} creations
+    - Varied tempo (avoid {last_tempo} BPM if recently used)
+    - Different key from {last_key}
+    - Multiple creative variations
+    
+    Return JSON with musical intent and variations.
+    """
+
+# Key choices used when varying away from the previous creation
+KEYS = ('C', 'D', 'E', 'F', 'G', 'A', 'B')
+KEY_MODIFIERS = ('', 'm', 'maj7', 'm7')
+MINOR_KEYS = tuple(f"{k} minor" for k in KEYS)
+
+# MIDI pitch per element type, matched by substring in this order
+PITCH_TABLE = (
+    ('kick', 36),
+    ('snare', 38),
+    ('hat', 42),
+    ('hihat', 42),
+    ('clap', 39),
+    ('bass', 36),
+    ('lead', 60),
+    ('pad', 48),
+)
+
+
+@lru_cache(maxsize=256)
+def _pitch_for(element: str) -> int:
+    """MIDI pitch for a lowercase element name"""
+    for key, pitch in PITCH_TABLE:
+        if key in element:
+            return pitch
+    
+    return 60  # Default middle C
+
+
+def _shifted_index(current: int, size: int) -> int:
+    """Return a random index in range(size) that is never ``current``"""
+    return (current + random.randint(1, size - 1)) % size
+
+
 @dataclass
 class CreativeMemory:
     """Stores previous creations to avoid repetition"""
     pattern_history: deque = field(default_factory=lambda: deque(maxlen=100))
     used_progressions: deque = field(default_factory=lambda: deque(maxlen=50))
     style_combinations: deque = field(default_factory=lambda: deque(maxlen=50))
-    rhythm_hashes: set = field(default_factory=set)
-    melody_hashes: set = field(default_factory=set)
+    rhythm_hashes: 'OrderedDict[int, None]' = field(default_factory=OrderedDict)  # Insertion-ordered set
+    melody_hashes: Set[int] = field(default_factory=set)
     last_tempo: Optional[int] = None
     last_key: Optional[str] = None
     last_genre: Optional[str] = None
     creation_count: int = 0
-    variation_seeds: List[int] = field(default_factory=list)
+    variation_seeds: deque = field(default_factory=lambda: deque(maxlen=100))
+    recent_hashes: deque = field(default_factory=lambda: deque(maxlen=20))  # Int form of recent history
+    seen_filter: bytearray = field(default_factory=lambda: bytearray(BLOOM_BITS // 8), repr=False)
     
     def is_too_similar(self, pattern_hash: str, threshold: float = 0.8) -> bool:
         """Check if pattern is too similar to recent ones"""
-        # Check exact matches in recent history
-        recent = list(self.pattern_history)[-20:]
-        if pattern_hash in recent:
+        value = int(pattern_hash, 16)
+        
+        # Check exact matches in recent history; the Bloom filter rules out
+        # hashes never seen before without scanning
+        if self._may_have_seen(value) and value in self.recent_hashes:
             return True
         
-        # Check similarity score (simplified)
-        for prev_hash in recent[-10:]:
-            if self._calculate_similarity(pattern_hash, prev_hash) > threshold:
+        # Check similarity as the fraction of equal bits (Hamming distance)
+        max_distance = (1 - threshold) * HASH_BITS
+        for prev_hash in islice(reversed(self.recent_hashes), 10):
+            if _popcount(value ^ prev_hash) < max_distance:
                 return True
         
         return False
     
-    def _calculate_similarity(self, hash1: str, hash2: str) -> float:
-        """Calculate similarity between two hashes (simplified)"""
-        # In real implementation, this would compare actual patterns
-        matching = sum(1 for a, b in zip(hash1, hash2) if a == b)
-        return matching / max(len(hash1), len(hash2))
+    def remember_rhythm(self, pattern_hash: int):
+        """Record a rhythm hash, forgetting the oldest past RHYTHM_HASH_LIMIT"""
+        self.rhythm_hashes[pattern_hash] = None
+        if len(self.rhythm_hashes) > RHYTHM_HASH_LIMIT:
+            self.rhythm_hashes.popitem(last=False)
+    
+    def _may_have_seen(self, value: int) -> bool:
+        """Bloom filter lookup: False means the hash was never added"""
+        return all(self.seen_filter[bit >> 3] & (1 << (bit & 7)) for bit in _bloom_probes(value))
     
     def add_creation(self, pattern_hash: str, tempo: int, key: str, genre: str):
         """Add a new creation to memory"""
         self.pattern_history.append(pattern_hash)
+        value = int(pattern_hash, 16)
+        self.recent_hashes.append(value)
+        for bit in _bloom_probes(value):
+            self.seen_filter[bit >> 3] |= 1 << (bit & 7)
         self.last_tempo = tempo
         self.last_key = key
         self.last_genre = genre
         self.creation_count += 1
         
         # Generate new variation seed
-        seed = int(hashlib.md5(f"{pattern_hash}{self.creation_count}".encode()).hexdigest()[:8], 16)
+        digest = hashlib.blake2b(SEED_STRUCT.pack(value, self.creation_count), digest_size=4).digest()
+        seed = int.from_bytes(digest, 'little')
         self.variation_seeds.append(seed)
     
+    def recent_patterns(self, n: int) -> List[str]:
+        """Last n pattern hashes, oldest first, without copying the history"""
+        recent = list(islice(reversed(self.pattern_history), n))
+        recent.reverse()
+        return recent
+    
     def get_variation_multiplier(self) -> float:
         """Get a multiplier to increase variation over time"""
         # More variations as we create more to avoid repetition
@@ -93,77 +460,122 @@ class CreativeMemory:
 class PatternGenerator:
     """Advanced pattern generation with anti-repetition algorithms"""
     
+    __slots__ = ('memory', 'mutation_rate', '_rng', '_scratch', '_base_arrays')
+    
     def __init__(self, memory: CreativeMemory):
         self.memory = memory
         self.mutation_rate = 0.1
+        self._rng = np.random.default_rng() if HAS_NUMPY else None
+        # Reused candidate buffer and per-base-pattern arrays for batches
+        self._scratch = np.empty((CANDIDATE_BATCH, 16), dtype=np.int8) if HAS_NUMPY else None
+        self._base_arrays: Dict[Tuple[int, ...], Any] = {}
         
     def generate_unique_rhythm(self, genre: str, element: str, length: int = 16) -> List[int]:
         """Generate a unique rhythm pattern"""
         
+        genre = genre.lower()
+        
         # Start with a base pattern
         base = self._get_base_pattern(genre, element)
         
-        # Apply mutations until unique
+        # Apply mutations until unique, a batch of candidates at a time
+        rate = min(MAX_MUTATION_RATE, self.mutation_rate * self.memory.get_variation_multiplier())
         attempts = 0
-        while attempts < 50:
-            pattern = self._mutate_pattern(base, self.mutation_rate * self.memory.get_variation_multiplier())
-            pattern_hash = self._hash_pattern(pattern)
+        max_attempts = 50
+        while attempts < max_attempts:
+            if rate >= MAX_MUTATION_RATE:
+                # Saturated mutation is no better than a random pattern
+                max_attempts = min(max_attempts, attempts + SATURATED_ATTEMPTS)
+            batch = min(CANDIDATE_BATCH, max_attempts - attempts)
             
-            if pattern_hash not in self.memory.rhythm_hashes:
-                self.memory.rhythm_hashes.add(pattern_hash)
-                return pattern
+            for pattern, pattern_hash in self._generate_batch(base, rate, batch):
+                if pattern_hash not in self.memory.rhythm_hashes:
+                    self.memory.remember_rhythm(pattern_hash)
+                    return pattern
             
-            attempts += 1
-            self.mutation_rate += 0.02  # Increase mutation rate with each attempt
+            attempts += batch
+            rate = min(MAX_MUTATION_RATE, rate + 0.02 * batch)  # Increase mutation rate with each attempt
         
         # If all else fails, generate completely random pattern
         return self._generate_random_pattern(length, genre, element)
     
-    def _get_base_pattern(self, genre: str, element: str) -> List[int]:
-        """Get base pattern for genre and element"""
-        patterns = {
-            'house': {
-                'kick': [1,0,0,0,1,0,0,0,1,0,0,0,1,0,0,0],
-                'snare': [0,0,0,0,1,0,0,0,0,0,0,0,1,0,0,0],
-                'hat': [0,0,1,0,0,0,1,0,0,0,1,0,0,0,1,0]
-            },
-            'techno': {
-                'kick': [1,0,0,1,1,0,0,0,1,0,0,1,1,0,0,0],
-                'snare': [0,0,0,0,1,0,0,1,0,0,0,0,1,0,0,1],
-                'hat': [1,1,0,1,1,1,0,1,1,1,0,1,1,1,0,1]
-            },
-            'dnb': {
-                'kick': [1,0,0,0,0,0,1,0,0,1,0,0,0,0,0,0],
-                'snare': [0,0,0,0,1,0,0,0,0,0,0,0,1,0,0,0],
-                'hat': [1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1]
-            },
-            'dubstep': {
-                'kick': [1,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0],
-                'snare': [0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0],
-                'hat': [0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]
-            }
-        }
-        
-        genre_patterns = patterns.get(genre.lower(), patterns['house'])
-        return genre_patterns.get(element, [1,0,0,0,1,0,0,0,1,0,0,0,1,0,0,0])
+    def _get_base_pattern(self, genre: str, element: str) -> Tuple[int, ...]:
+        """Get base pattern for genre (lowercase) and element"""
+        genre_patterns = BASE_PATTERNS.get(genre, BASE_PATTERNS['house'])
+        return genre_patterns.get(element, DEFAULT_BASE_PATTERN)
+    
+    def _generate_batch(self, base: Tuple[int, ...], rate: float, n: int):
+        """Yield n mutated candidates of base with their pattern hashes"""
+        if not HAS_NUMPY:
+            for _ in range(n):
+                pattern = self._mutate_pattern(base, rate)
+                yield pattern, self._hash_pattern(pattern)
+            return
+        
+        length = len(base)
+        base_array = self._base_arrays.get(base)
+        if base_array is None:
+            base_array = self._base_arrays[base] = np.array(base, dtype=np.int8)
+        if self._scratch.shape[1] < length or self._scratch.shape[0] < n:
+            self._scratch = np.empty((max(n, CANDIDATE_BATCH), length), dtype=np.int8)
+        candidates = self._scratch[:n, :length]
+        
+        draws = self._rng.random((n, length))
+        strategies = self._rng.integers(0, len(MUTATIONS), (n, length))
+        
+        if HAS_NUMBA:
+            # Mutate, fix up and hash the whole batch in native code
+            hashes = np.empty(n, dtype=np.int64)
+            _mutate_candidates(candidates, base_array, draws, strategies, rate, hashes)
+            for row, pattern_hash in enumerate(hashes.tolist()):
+                yield candidates[row].tolist(), pattern_hash
+            return
+        
+        candidates[:] = base_array
+        
+        # np.nonzero walks row-major, i.e. each candidate's steps in order
+        rows, steps = np.nonzero(draws < rate)
+        for row, i, choice in zip(rows.tolist(), steps.tolist(),
+                                  strategies[rows, steps].tolist()):
+            self._apply_mutation(candidates[row], i, MUTATIONS[choice])
+        
+        # Ensure no pattern is empty (at least one hit)
+        candidates[~candidates.any(axis=1), 0] = 1
+        
+        hashes = (candidates @ (1 << np.arange(length, dtype=np.int64))).tolist()
+        for row, pattern_hash in enumerate(hashes):
+            # The buffer is reused by the next batch, so hand out copies
+            yield candidates[row].tolist(), pattern_hash
     
-    def _mutate_pattern(self, pattern: List[int], rate: float) -> List[int]:
+    @staticmethod
+    def _apply_mutation(mutated, i: int, strategy: str):
+        """Apply one mutation strategy at step i, in place"""
+        if strategy == 'flip':
+            mutated[i] = 1 - mutated[i]
+        elif strategy == 'shift' and i > 0:
+            mutated[i], mutated[i-1] = mutated[i-1], mutated[i]
+        elif strategy == 'double' and i < len(mutated) - 1:
+            mutated[i+1] = mutated[i]
+        elif strategy == 'remove':
+            mutated[i] = 0
+    
+    def _mutate_pattern(self, pattern: Tuple[int, ...], rate: float) -> List[int]:
         """Mutate pattern with given rate"""
-        mutated = pattern.copy()
-        
-        for i in range(len(mutated)):
-            if random.random() < rate:
-                # Different mutation strategies
-                strategy = random.choice(['flip', 'shift', 'double', 'remove'])
-                
-                if strategy == 'flip':
-                    mutated[i] = 1 - mutated[i]
-                elif strategy == 'shift' and i > 0:
-                    mutated[i], mutated[i-1] = mutated[i-1], mutated[i]
-                elif strategy == 'double' and i < len(mutated) - 1:
-                    mutated[i+1] = mutated[i]
-                elif strategy == 'remove':
-                    mutated[i] = 0
+        mutated = list(pattern)
+        length = len(mutated)
+        
+        # Draw which steps mutate and how in bulk, then apply only those in
+        # step order ('double' and 'shift' read neighbours earlier steps wrote)
+        if HAS_NUMPY:
+            steps = np.flatnonzero(self._rng.random(length) < rate).tolist()
+            strategies = self._rng.integers(0, len(MUTATIONS), len(steps)).tolist()
+        else:
+            steps = [i for i in range(length) if random.random() < rate]
+            strategies = [random.randrange(len(MUTATIONS)) for _ in steps]
+        
+        for i, choice in zip(steps, strategies):
+            # Different mutation strategies
+            self._apply_mutation(mutated, i, MUTATIONS[choice])
         
         # Ensure pattern isn't empty
         if sum(mutated) == 0:
@@ -174,6 +586,14 @@ class PatternGenerator:
     def _generate_random_pattern(self, length: int, genre: str, element: str) -> List[int]:
         """Generate completely random pattern based on genre characteristics"""
         density = self._get_density(genre, element)
+        
+        if HAS_NUMPY:
+            # One threshold per step, drawn against in a single call
+            thresholds = np.full(length, density)
+            if element == 'kick':
+                thresholds[::4] = density * 1.5  # Higher probability on downbeats for kicks
+            return (self._rng.random(length) < thresholds).astype(np.int8).tolist()
+        
         pattern = []
         
         for i in range(length):
@@ -186,21 +606,16 @@ class PatternGenerator:
         return pattern
     
     def _get_density(self, genre: str, element: str) -> float:
-        """Get hit density for genre and element"""
-        densities = {
-            'house': {'kick': 0.25, 'snare': 0.125, 'hat': 0.25},
-            'techno': {'kick': 0.3, 'snare': 0.15, 'hat': 0.5},
-            'dnb': {'kick': 0.2, 'snare': 0.125, 'hat': 0.7},
-            'dubstep': {'kick': 0.125, 'snare': 0.0625, 'hat': 0.1},
-            'trap': {'kick': 0.15, 'snare': 0.1, 'hat': 0.6}
-        }
-        
-        genre_density = densities.get(genre.lower(), densities['house'])
+        """Get hit density for genre (lowercase) and element"""
+        genre_density = PATTERN_DENSITIES.get(genre, PATTERN_DENSITIES['house'])
         return genre_density.get(element, 0.25)
     
-    def _hash_pattern(self, pattern: List[int]) -> str:
-        """Create hash of pattern"""
-        return hashlib.md5(''.join(map(str, pattern)).encode()).hexdigest()[:16]
+    def _hash_pattern(self, pattern: List[int]) -> int:
+        """Pack a binary pattern into an int identity, step i in bit i"""
+        bits = 0
+        for i, hit in enumerate(pattern):
+            bits |= hit << i
+        return bits
 
 
 class GPT5AdvancedBrain(LMMSAIBrain):
@@ -263,188 +678,55 @@ class GPT5AdvancedBrain(LMMSAIBrain):
     def _determine_mode(self, request: str) -> GPTMode:
         """Determine best GPT mode based on request"""
         request_lower = request.lower()
+        words = set(WORD_PATTERN.findall(request_lower))
         
-        # Keywords for different modes
-        if any(word in request_lower for word in ['quick', 'simple', 'fast', 'basic']):
-            return GPTMode.FAST
-        elif any(word in request_lower for word in ['like', 'style of', 'similar to', 'inspired by']):
-            return GPTMode.RESEARCH
-        elif any(word in request_lower for word in ['experimental', 'unique', 'creative', 'unusual']):
-            return GPTMode.CREATIVE
-        elif any(word in request_lower for word in ['analyze', 'technical', 'detailed', 'specific']):
-            return GPTMode.ANALYTICAL
-        elif any(word in request_lower for word in ['complex', 'intricate', 'sophisticated']):
-            return GPTMode.DEEP_THINKING
-        else:
-            return GPTMode.BALANCED
+        # Keywords for different modes, checked in priority order
+        for mode, keywords, phrases in MODE_KEYWORDS:
+            if not words.isdisjoint(keywords) or any(phrase in request_lower for phrase in phrases):
+                return mode
+        
+        return GPTMode.BALANCED
     
-    def _get_model_config(self, mode: GPTMode) -> Dict[str, Any]:
+    def _get_model_config(self, mode: GPTMode) -> Mapping[str, Any]:
         """Get model configuration for mode"""
-        configs = {
-            GPTMode.FAST: {
-                'model': 'gpt-3.5-turbo',  # Simulated GPT-5 fast
-                'temperature': 0.3,
-                'max_tokens': 500,
-                'presence_penalty': 0.0,
-                'frequency_penalty': 0.0
-            },
-            GPTMode.BALANCED: {
-                'model': 'gpt-4',  # Simulated GPT-5 balanced
-                'temperature': 0.7,
-                'max_tokens': 1500,
-                'presence_penalty': 0.3,
-                'frequency_penalty': 0.3
-            },
-            GPTMode.DEEP_THINKING: {
-                'model': 'gpt-4-turbo-preview',  # Simulated GPT-5 deep
-                'temperature': 0.6,
-                'max_tokens': 3000,
-                'presence_penalty': 0.5,
-                'frequency_penalty': 0.5
-            },
-            GPTMode.RESEARCH: {
-                'model': 'gpt-4-turbo-preview',  # Simulated GPT-5 research
-                'temperature': 0.4,
-                'max_tokens': 4000,
-                'presence_penalty': 0.2,
-                'frequency_penalty': 0.4
-            },
-            GPTMode.CREATIVE: {
-                'model': 'gpt-4',  # Simulated GPT-5 creative
-                'temperature': 0.9,
-                'max_tokens': 2000,
-                'presence_penalty': 0.7,
-                'frequency_penalty': 0.7
-            },
-            GPTMode.ANALYTICAL: {
-                'model': 'gpt-4',  # Simulated GPT-5 analytical
-                'temperature': 0.2,
-                'max_tokens': 2500,
-                'presence_penalty': 0.1,
-                'frequency_penalty': 0.1
-            }
-        }
-        
-        return configs.get(mode, configs[GPTMode.BALANCED])
+        return MODEL_CONFIGS.get(mode, MODEL_CONFIGS[GPTMode.BALANCED])
     
     def _get_system_message(self, mode: GPTMode) -> str:
         """Get system message for mode"""
-        messages = {
-            GPTMode.FAST: "You are a quick music assistant. Provide fast, practical solutions.",
-            
-            GPTMode.BALANCED: """You are an expert music producer. Balance creativity with technical accuracy.
-            Focus on creating unique patterns that don't repeat previous creations.""",
-            
-            GPTMode.DEEP_THINKING: """You are a master music producer and theorist. Think deeply about:
-            - The emotional impact of each musical choice
-            - How different elements interact harmonically and rhythmically
-            - Creating completely unique patterns and progressions
-            - Avoiding any repetition from previous works""",
-            
-            GPTMode.RESEARCH: """You are a music research AI that deeply analyzes artist styles.
-            Extract the DNA of the requested style including:
-            - Signature rhythm patterns and groove
-            - Unique production techniques
-            - Harmonic and melodic tendencies
-            - Mix and mastering approach
-            Create variations that capture the essence while being original.""",
-            
-            GPTMode.CREATIVE: """You are an experimental music AI. Your goal is to:
-            - Create never-before-heard patterns and combinations
-            - Push boundaries while maintaining musicality
-            - Combine unexpected elements that work together
-            - Generate multiple wildly different variations""",
-            
-            GPTMode.ANALYTICAL: """You are a technical music analysis AI. Focus on:
-            - Precise technical specifications
-            - Frequency analysis and sonic characteristics
-            - Detailed production chain recommendations
-            - Mathematical relationships in rhythm and harmony"""
-        }
-        
-        return messages.get(mode, messages[GPTMode.BALANCED])
+        return SYSTEM_MESSAGES.get(mode, SYSTEM_MESSAGES[GPTMode.BALANCED])
     
     def _get_mode_specific_prompt(self, request: str, mode: GPTMode) -> str:
         """Generate mode-specific prompt"""
         
         # Add memory context
-        memory_context = f"""
-        Previous creations to AVOID repeating:
-        - Last tempo: {self.memory.last_tempo}
-        - Last key: {self.memory.last_key}
-        - Last genre: {self.memory.last_genre}
-        - Patterns used: {len(self.memory.pattern_history)} unique patterns
-        - Creation number: {self.memory.creation_count + 1}
-        
-        IMPORTANT: Generate completely NEW and DIFFERENT patterns!
-        """
-        
-        if mode == GPTMode.RESEARCH:
-            return f"""
-            Deep style research for: "{request}"
-            
-            {memory_context}
-            
-            Analyze and extract:
-            1. Rhythm DNA (specific patterns, not generic)
-            2. Harmonic DNA (exact progressions and voicings)
-            3. Production DNA (specific techniques and effects)
-            4. Signature elements that define this style
-            5. Generate 5 DIFFERENT variations that capture the essence
-            
-            Return JSON with detailed analysis and multiple unique options.
-            """
-        
-        elif mode == GPTMode.CREATIVE:
-            return f"""
-            Maximum creativity for: "{request}"
-            
-            {memory_context}
-            
-            Generate something completely unique:
-            1. Invent NEW rhythm patterns (not standard patterns)
-            2. Create unexpected harmonic progressions
-            3. Combine {random.choice(['organic', 'digital', 'found'])} with {random.choice(['synthetic', 'acoustic', 'processed'])} sounds
-            4. Generate {random.randint(5, 8)} wildly different variations
-            
-            Randomization seed: {random.randint(1000, 9999)}
-            
-            Return JSON with multiple innovative options.
-            """
+        memory_context = MEMORY_CONTEXT_TEMPLATE.format(
+            last_tempo=self.memory.last_tempo,
+            last_key=self.memory.last_key,
+            last_genre=self.memory.last_genre,
+            pattern_count=len(self.memory.pattern_history),
+            creation_number=self.memory.creation_count + 1
+        )
         
+        fields = {}
+        if mode == GPTMode.CREATIVE:
+            fields = {
+                'source': random.choice(SOUND_SOURCES),
+                'texture': random.choice(SOUND_TEXTURES),
+                'variations': random.randint(5, 8),
+                'seed': random.randint(1000, 9999),
+            }
         elif mode == GPTMode.DEEP_THINKING:
-            return f"""
-            Deep analysis for: "{request}"
-            
-            {memory_context}
-            
-            Consider deeply:
-            1. Emotional journey and dynamics
-            2. Tension and release patterns
-            3. Frequency spectrum utilization
-            4. Groove and pocket placement
-            5. Generate {random.randint(4, 6)} sophisticated variations
-            
-            Each variation must be significantly different from others.
-            
-            Return comprehensive JSON with detailed variations.
-            """
-        
-        else:
-            # Default prompt with anti-repetition emphasis
-            return f"""
-            Analyze: "{request}"
-            
-            {memory_context}
-            
-            Create unique music with:
-            - Fresh patterns different from the last {self.memory.creation_count} creations
-            - Varied tempo (avoid {self.memory.last_tempo} BPM if recently used)
-            - Different key from {self.memory.last_key}
-            - Multiple creative variations
-            
-            Return JSON with musical intent and variations.
-            """
+            fields = {'variations': random.randint(4, 6)}
+        
+        template = PROMPT_TEMPLATES.get(mode, DEFAULT_PROMPT_TEMPLATE)
+        return template.format(
+            request=request,
+            memory_context=memory_context,
+            creation_count=self.memory.creation_count,
+            last_tempo=self.memory.last_tempo,
+            last_key=self.memory.last_key,
+            **fields
+        )
     
     def _create_varied_intent(self, intent_data: Dict[str, Any]) -> MusicalIntent:
         """Create intent with built-in variations"""
@@ -466,7 +748,7 @@ class GPT5AdvancedBrain(LMMSAIBrain):
         
         # Add variation instructions
         intent.specific_requirements['variation_level'] = self.memory.get_variation_multiplier()
-        intent.specific_requirements['avoid_patterns'] = list(self.memory.pattern_history)[-5:]
+        intent.specific_requirements['avoid_patterns'] = self.memory.recent_patterns(5)
         
         return intent
     
@@ -488,14 +770,11 @@ class GPT5AdvancedBrain(LMMSAIBrain):
             return None
         
         if base_key == self.memory.last_key:
-            # Choose a related but different key
-            keys = ['C', 'D', 'E', 'F', 'G', 'A', 'B']
-            modifiers = ['', 'm', 'maj7', 'm7']
+            # Choose a different root, stepping away from the current one
+            root = base_key[:1].upper()
+            index = KEYS.index(root) if root in KEYS else 0
             
-            new_key = random.choice(keys)
-            new_modifier = random.choice(modifiers)
-            
-            return f"{new_key}{new_modifier}"
+            return KEYS[_shifted_index(index, len(KEYS))] + KEY_MODIFIERS[random.randint(0, 3)]
         
         return base_key
     
@@ -515,8 +794,10 @@ class GPT5AdvancedBrain(LMMSAIBrain):
             intent.tempo = random.randint(70, 170)
         
         if intent.key == self.memory.last_key:
-            keys = ['C minor', 'D minor', 'E minor', 'F minor', 'G minor', 'A minor', 'B minor']
-            intent.key = random.choice([k for k in keys if k != self.memory.last_key])
+            if intent.key in MINOR_KEYS:
+                intent.key = MINOR_KEYS[_shifted_index(MINOR_KEYS.index(intent.key), len(MINOR_KEYS))]
+            else:
+                intent.key = random.choice(MINOR_KEYS)
         
         return intent
     
@@ -534,6 +815,9 @@ class GPT5AdvancedBrain(LMMSAIBrain):
         # Generate base plan
         plan = super().generate_production_plan(intent)
         
+        # Fingerprint of the plan, folded from its rhythms and identity fields
+        plan_hash = ((intent.tempo or 0) * FINGERPRINT_PRIME) ^ _identity_digest(intent.key, intent.genre)
+        
         # Replace patterns with unique ones
         for pattern in plan.patterns:
             element = pattern['track'].lower()
@@ -546,23 +830,14 @@ class GPT5AdvancedBrain(LMMSAIBrain):
             )
             
             # Convert to note pattern
-            new_notes = []
-            for i, hit in enumerate(unique_rhythm):
-                if hit:
-                    new_notes.append({
-                        'pitch': self._get_pitch_for_element(element),
-                        'position': i * 3,
-                        'length': 3,
-                        'velocity': 80 + random.randint(-20, 20)
-                    })
-            
-            pattern['notes'] = new_notes
-            pattern['unique_hash'] = self.pattern_generator._hash_pattern(unique_rhythm)
+            pattern['notes'] = self._rhythm_to_notes(unique_rhythm, self._get_pitch_for_element(element))
+            rhythm_hash = self.pattern_generator._hash_pattern(unique_rhythm)
+            pattern['unique_hash'] = f"{rhythm_hash:016x}"
+            plan_hash = ((plan_hash ^ rhythm_hash) * FINGERPRINT_PRIME) & HASH_MASK
         
         # Update memory
-        plan_hash = hashlib.md5(str(plan).encode()).hexdigest()[:16]
         self.memory.add_creation(
-            plan_hash,
+            f"{plan_hash & HASH_MASK:016x}",
             intent.tempo or 120,
             intent.key or 'C',
             intent.genre or 'house'
@@ -570,24 +845,26 @@ class GPT5AdvancedBrain(LMMSAIBrain):
         
         return plan
     
+    def _rhythm_to_notes(self, rhythm: List[int], pitch: int) -> List[Dict[str, int]]:
+        """Turn a binary rhythm into note dicts, one per hit"""
+        if HAS_NUMPY:
+            # Hit positions and velocities as whole arrays, dicts only at the end
+            steps = np.flatnonzero(rhythm)
+            velocities = 80 + self.pattern_generator._rng.integers(-20, 21, steps.size)
+            positions = steps * 3
+            return [
+                {'pitch': pitch, 'position': position, 'length': 3, 'velocity': velocity}
+                for position, velocity in zip(positions.tolist(), velocities.tolist())
+            ]
+        
+        return [
+            {'pitch': pitch, 'position': i * 3, 'length': 3, 'velocity': 80 + random.randint(-20, 20)}
+            for i, hit in enumerate(rhythm) if hit
+        ]
+    
     def _get_pitch_for_element(self, element: str) -> int:
         """Get MIDI pitch for element type"""
-        pitches = {
-            'kick': 36,
-            'snare': 38,
-            'hat': 42,
-            'hihat': 42,
-            'clap': 39,
-            'bass': 36,
-            'lead': 60,
-            'pad': 48
-        }
-        
-        for key, pitch in pitches.items():
-            if key in element.lower():
-                return pitch
-        
-        return 60  # Default middle C
+        return _pitch_for(element.lower())
 
 
 def main():
@@ -620,7 +897,7 @@ def main():
         
         # Show that patterns are different
         if brain.memory.pattern_history:
-            recent = list(brain.memory.pattern_history)[-3:]
+            recent = brain.memory.recent_patterns(3)
             print(f"Recent pattern hashes: {recent}")
         
         time.sleep(0.5)  # Small delay between creations
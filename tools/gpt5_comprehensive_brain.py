@@ -7,10 +7,22 @@ Complete AI system that can handle ALL aspects of music production
 import os
 import sys
 import json
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass
+import logging
+import re
+import time
+import itertools
+from typing import Dict, FrozenSet, List, Any, Optional, Set, Union
+from dataclasses import dataclass, field
+from collections import namedtuple
+from functools import cached_property, wraps
 from enum import Enum
 
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from lmms_ai_brain import LMMSAIBrain
@@ -26,6 +38,30 @@ from music_production_complete import (
     ProjectManagementEngine
 )
 
+logger = logging.getLogger(__name__)
+
+
+# Keywords that trigger specific production requests
+SPECIFIC_REQUEST_TRIGGERS = (
+    'sidechain', 'parallel compress', 'bus', 'group',
+    'reverb', 'shimmer', 'delay', 'dub', 'distortion', 'multiband',
+    'supersaw', 'reese', 'fm', 'vocoder',
+    'buildup', 'build', 'drop', 'transition',
+    'glitch', 'vinyl', 'time stretch', 'pitch shift'
+)
+
+
+def _build_trigger_automaton():
+    """Aho-Corasick automaton reporting every trigger in one pass"""
+    automaton = ahocorasick.Automaton()
+    for trigger in SPECIFIC_REQUEST_TRIGGERS:
+        automaton.add_word(trigger, trigger)
+    automaton.make_automaton()
+    return automaton
+
+
+TRIGGER_AUTOMATON = _build_trigger_automaton() if HAS_AHOCORASICK else None
+
 
 class ProductionRequest(Enum):
     """Types of production requests"""
@@ -41,19 +77,135 @@ class ProductionRequest(Enum):
     ANALYZE = "analyze"
 
 
+# Words that count as each request keyword. Requests are matched word by word,
+# so every keyword lists its inflections; the groups below are all built from
+# this one table
+KEYWORD_WORDS = {
+    'create': frozenset({'create', 'creates', 'created', 'creating'}),
+    'make': frozenset({'make', 'makes', 'making'}),
+    'generate': frozenset({'generate', 'generates', 'generated', 'generating'}),
+    'produce': frozenset({'produce', 'produces', 'produced', 'producing'}),
+    'mix': frozenset({'mix', 'mixes', 'mixed', 'mixing', 'mixdown'}),
+    'balance': frozenset({'balance', 'balances', 'balanced', 'balancing'}),
+    'level': frozenset({'level', 'levels', 'leveled', 'leveling', 'levelled', 'levelling'}),
+    'eq': frozenset({'eq', 'eqs', 'eqed', 'eqing',
+                     'equalize', 'equalizes', 'equalized', 'equalizing', 'equalizer', 'equalization',
+                     'equalise', 'equalises', 'equalised', 'equalising', 'equaliser', 'equalisation'}),
+    'master': frozenset({'master', 'masters', 'mastered', 'mastering'}),
+    'finalize': frozenset({'finalize', 'finalizes', 'finalized', 'finalizing',
+                           'finalise', 'finalises', 'finalised', 'finalising'}),
+    'polish': frozenset({'polish', 'polishes', 'polished', 'polishing'}),
+    'arrange': frozenset({'arrange', 'arranges', 'arranged', 'arranging', 'arrangement', 'arrangements'}),
+    'structure': frozenset({'structure', 'structures', 'structured', 'structuring'}),
+    'intro': frozenset({'intro', 'intros'}),
+    'verse': frozenset({'verse', 'verses'}),
+    'chorus': frozenset({'chorus', 'choruses'}),
+    'design': frozenset({'design', 'designs', 'designed', 'designing'}),
+    'synthesize': frozenset({'synthesize', 'synthesizes', 'synthesized', 'synthesizing',
+                             'synthesise', 'synthesises', 'synthesised', 'synthesising'}),
+    'sound': frozenset({'sound', 'sounds'}),
+    'patch': frozenset({'patch', 'patches'}),
+    'automate': frozenset({'automate', 'automates', 'automated', 'automating', 'automation', 'automations'}),
+    'modulate': frozenset({'modulate', 'modulates', 'modulated', 'modulating', 'modulation', 'modulations'}),
+    'lfo': frozenset({'lfo', 'lfos'}),
+    'envelope': frozenset({'envelope', 'envelopes'}),
+    'process': frozenset({'process', 'processes', 'processed', 'processing'}),
+    'stretch': frozenset({'stretch', 'stretches', 'stretched', 'stretching'}),
+    'pitch': frozenset({'pitch', 'pitches', 'pitched'}),
+    'warp': frozenset({'warp', 'warps', 'warped', 'warping'}),
+    'effect': frozenset({'effect', 'effects'}),
+    'reverb': frozenset({'reverb', 'reverbs'}),
+    'delay': frozenset({'delay', 'delays', 'delayed'}),
+    'distortion': frozenset({'distortion', 'distortions', 'distort', 'distorts', 'distorted', 'distorting'}),
+    'enhance': frozenset({'enhance', 'enhances', 'enhanced', 'enhancing'}),
+    'improve': frozenset({'improve', 'improves', 'improved', 'improving'}),
+    'better': frozenset({'better'}),
+    'sidechain': frozenset({'sidechain', 'sidechains', 'sidechained', 'sidechaining'}),
+    'compress': frozenset({'compress', 'compresses', 'compressed', 'compressing',
+                           'compression', 'compressor', 'compressors'}),
+    'sweep': frozenset({'sweep', 'sweeps', 'swept', 'sweeping'}),
+    'pan': frozenset({'pan', 'pans', 'panned', 'panning'}),
+}
+
+
+def _keyword_words(*keywords: str) -> FrozenSet[str]:
+    """Words matching any of the keywords"""
+    return frozenset().union(*(KEYWORD_WORDS[keyword] for keyword in keywords))
+
+
+# Request type keywords, checked in priority order (CREATE when none match)
+REQUEST_TYPE_KEYWORDS = (
+    (ProductionRequest.CREATE, _keyword_words('create', 'make', 'generate', 'produce')),
+    (ProductionRequest.MIX, _keyword_words('mix', 'balance', 'level', 'eq')),
+    (ProductionRequest.MASTER, _keyword_words('master', 'finalize', 'polish')),
+    (ProductionRequest.ARRANGE, _keyword_words('arrange', 'structure', 'intro', 'verse', 'chorus')),
+    (ProductionRequest.DESIGN, _keyword_words('design', 'synthesize', 'sound', 'patch')),
+    (ProductionRequest.AUTOMATE, _keyword_words('automate', 'modulate', 'lfo', 'envelope')),
+    (ProductionRequest.PROCESS, _keyword_words('process', 'stretch', 'pitch', 'warp')),
+    (ProductionRequest.EFFECT, _keyword_words('effect', 'reverb', 'delay', 'distortion')),
+    (ProductionRequest.ENHANCE, _keyword_words('enhance', 'improve', 'better')),
+)
+
+GENRES = ('techno', 'house', 'dnb', 'dubstep', 'trap', 'ambient', 'trance')
+
+# Keywords that call for structure, mixing or automation parameters
+STRUCTURE_WORDS = _keyword_words('intro', 'verse', 'chorus')
+MIXING_WORDS = _keyword_words('sidechain', 'compress', 'eq')
+AUTOMATION_WORDS = _keyword_words('automate', 'sweep', 'modulate')
+
+# Words of a lowercased request
+WORD_PATTERN = re.compile(r"[a-z0-9_]+")
+# Sequence number appended to output filenames, unique within the process
+_FILE_COUNTER = itertools.count(1)
+
+
+def _output_filename(prefix: str) -> str:
+    """Project filename that never repeats, even within the same second or across processes"""
+    return f"{prefix}_{int(time.time())}_{os.getpid()}_{next(_FILE_COUNTER)}.mmp"
+
+
+def _saves_as(prefix: str):
+    """Save the project after the wrapped executor runs and return its filename"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, intent, *args, **kwargs):
+            method(self, intent, *args, **kwargs)
+            filename = _output_filename(prefix)
+            self.controller.save_project(filename)
+            return filename
+        return wrapper
+    return decorator
+
+
+# Default EDM structure; intents receive copies of these entries
+DEFAULT_STRUCTURE = (
+    {'section': 'intro', 'bars': 8},
+    {'section': 'buildup', 'bars': 8},
+    {'section': 'drop', 'bars': 16},
+    {'section': 'breakdown', 'bars': 8},
+    {'section': 'buildup', 'bars': 8},
+    {'section': 'drop', 'bars': 16},
+    {'section': 'outro', 'bars': 8}
+)
+
+
+# A project track with its name, and the lowercased name used for matching
+TrackRef = namedtuple('TrackRef', 'element name name_lower')
+
+
 @dataclass
 class ProductionIntent:
     """Comprehensive production intent"""
     request_type: ProductionRequest
     genre: Optional[str] = None
     style: Optional[str] = None
-    elements: List[str] = None
-    effects: List[str] = None
-    structure: List[Dict] = None
-    mixing: Dict[str, Any] = None
-    automation: List[Dict] = None
+    elements: List[str] = field(default_factory=list)
+    effects: List[str] = field(default_factory=list)
+    structure: List[Dict] = field(default_factory=list)
+    mixing: Dict[str, Any] = field(default_factory=dict)
+    automation: List[Dict] = field(default_factory=list)
     reference: Optional[str] = None
-    specific_requests: List[str] = None
+    specific_requests: List[str] = field(default_factory=list)
 
 
 class GPT5ComprehensiveBrain:
@@ -63,191 +215,221 @@ class GPT5ComprehensiveBrain:
     """
     
     def __init__(self):
-        self.controller = LMMSCompleteController()
-        self.ai_brain = LMMSAIBrain()
-        self.production_system = ComprehensiveMusicProductionSystem(self.controller)
+        # Executor per request type; unlisted types create a track
+        self._executors = {
+            ProductionRequest.CREATE: self._execute_create,
+            ProductionRequest.MIX: self._execute_mix,
+            ProductionRequest.MASTER: self._execute_master,
+            ProductionRequest.ARRANGE: self._execute_arrange,
+            ProductionRequest.DESIGN: self._execute_sound_design,
+            ProductionRequest.AUTOMATE: self._execute_automation,
+            ProductionRequest.PROCESS: self._execute_processing,
+            ProductionRequest.EFFECT: self._execute_effects,
+            ProductionRequest.ENHANCE: self._execute_enhance,
+        }
+        
+        # Actions for specific requests applied after creating a track
+        self._request_actions = {
+            'sidechain_compression': lambda: self.production_system.mixing.apply_sidechain_compression('Kick', ['Bass', 'Pad']),
+            'buildup': lambda: self.production_system.arrangement.create_buildup(8, 8),
+            'drop': lambda: self.production_system.arrangement.create_drop(16),
+            # Add more as needed
+        }
         
+    # Subsystems are built on first use, so parsing alone stays cheap
+    @cached_property
+    def controller(self) -> LMMSCompleteController:
+        return LMMSCompleteController()
+    
+    @cached_property
+    def ai_brain(self) -> LMMSAIBrain:
+        return LMMSAIBrain()
+    
+    @cached_property
+    def production_system(self) -> ComprehensiveMusicProductionSystem:
+        return ComprehensiveMusicProductionSystem(self.controller)
+    
     def interpret_production_request(self, request: str) -> ProductionIntent:
         """Interpret any production request"""
         
+        # Structured callers can pass the intent itself as a JSON object
+        if request.lstrip().startswith('{'):
+            intent = self._intent_from_json(request)
+            if intent is not None:
+                return intent
+        
+        return self._parse_production_request(request)
+    
+    def _intent_from_json(self, request: str) -> Optional[ProductionIntent]:
+        """Build an intent from a JSON object of ProductionIntent fields.
+        
+        request_type holds the ProductionRequest value (e.g. "mix").
+        Returns None when the text is not such an object."""
+        try:
+            fields = json.loads(request)
+            fields['request_type'] = ProductionRequest(fields['request_type'])
+            return ProductionIntent(**fields)
+        except (ValueError, KeyError, TypeError):
+            return None
+    
+    def _parse_production_request(self, request: str) -> ProductionIntent:
+        """Parse a production request into an intent"""
+        
         request_lower = request.lower()
+        tokens = frozenset(WORD_PATTERN.findall(request_lower))
         
         # Determine request type
-        if any(word in request_lower for word in ['create', 'make', 'generate', 'produce']):
-            request_type = ProductionRequest.CREATE
-        elif any(word in request_lower for word in ['mix', 'balance', 'level', 'eq']):
-            request_type = ProductionRequest.MIX
-        elif any(word in request_lower for word in ['master', 'finalize', 'polish']):
-            request_type = ProductionRequest.MASTER
-        elif any(word in request_lower for word in ['arrange', 'structure', 'intro', 'verse', 'chorus']):
-            request_type = ProductionRequest.ARRANGE
-        elif any(word in request_lower for word in ['design', 'synthesize', 'sound', 'patch']):
-            request_type = ProductionRequest.DESIGN
-        elif any(word in request_lower for word in ['automate', 'modulate', 'lfo', 'envelope']):
-            request_type = ProductionRequest.AUTOMATE
-        elif any(word in request_lower for word in ['process', 'stretch', 'pitch', 'warp']):
-            request_type = ProductionRequest.PROCESS
-        elif any(word in request_lower for word in ['effect', 'reverb', 'delay', 'distortion']):
-            request_type = ProductionRequest.EFFECT
-        elif any(word in request_lower for word in ['enhance', 'improve', 'better']):
-            request_type = ProductionRequest.ENHANCE
-        else:
-            request_type = ProductionRequest.CREATE
+        request_type = ProductionRequest.CREATE
+        for candidate, words in REQUEST_TYPE_KEYWORDS:
+            if not words.isdisjoint(tokens):
+                request_type = candidate
+                break
         
         # Extract details
         intent = ProductionIntent(
             request_type=request_type,
-            specific_requests=self._extract_specific_requests(request)
+            specific_requests=self._extract_specific_requests(request_lower)
         )
         
         # Extract genre
-        for genre in ['techno', 'house', 'dnb', 'dubstep', 'trap', 'ambient', 'trance']:
-            if genre in request_lower:
+        for genre in GENRES:
+            if genre in tokens:
                 intent.genre = genre
                 break
         
         # Extract structure requests
-        if 'intro' in request_lower or 'verse' in request_lower or 'chorus' in request_lower:
-            intent.structure = self._extract_structure(request)
+        if not STRUCTURE_WORDS.isdisjoint(tokens):
+            intent.structure = self._extract_structure(request_lower)
         
         # Extract mixing requests
-        if 'sidechain' in request_lower or 'compress' in request_lower or 'eq' in request_lower:
-            intent.mixing = self._extract_mixing_params(request)
+        if not MIXING_WORDS.isdisjoint(tokens):
+            intent.mixing = self._extract_mixing_params(request_lower, tokens)
         
         # Extract automation requests
-        if 'automate' in request_lower or 'sweep' in request_lower or 'modulate' in request_lower:
-            intent.automation = self._extract_automation_params(request)
+        if not AUTOMATION_WORDS.isdisjoint(tokens):
+            intent.automation = self._extract_automation_params(request_lower, tokens)
         
         return intent
     
-    def _extract_specific_requests(self, request: str) -> List[str]:
-        """Extract specific production requests"""
+    def _extract_specific_requests(self, request_lower: str) -> List[str]:
+        """Extract specific production requests from the lowercased request"""
         requests = []
-        
-        request_lower = request.lower()
+        found = self._find_triggers(request_lower)
         
         # Mixing requests
-        if 'sidechain' in request_lower:
+        if 'sidechain' in found:
             requests.append('sidechain_compression')
-        if 'parallel compress' in request_lower:
+        if 'parallel compress' in found:
             requests.append('parallel_compression')
-        if 'bus' in request_lower or 'group' in request_lower:
+        if 'bus' in found or 'group' in found:
             requests.append('bus_routing')
         
         # Effect requests
-        if 'reverb' in request_lower:
-            if 'shimmer' in request_lower:
+        if 'reverb' in found:
+            if 'shimmer' in found:
                 requests.append('shimmer_reverb')
             else:
                 requests.append('reverb')
-        if 'delay' in request_lower:
-            if 'dub' in request_lower:
+        if 'delay' in found:
+            if 'dub' in found:
                 requests.append('dub_delay')
             else:
                 requests.append('delay')
-        if 'distortion' in request_lower:
-            if 'multiband' in request_lower:
+        if 'distortion' in found:
+            if 'multiband' in found:
                 requests.append('multiband_distortion')
             else:
                 requests.append('distortion')
         
         # Sound design requests
-        if 'supersaw' in request_lower:
+        if 'supersaw' in found:
             requests.append('supersaw')
-        if 'reese' in request_lower:
+        if 'reese' in found:
             requests.append('reese_bass')
-        if 'fm' in request_lower:
+        if 'fm' in found:
             requests.append('fm_synthesis')
-        if 'vocoder' in request_lower:
+        if 'vocoder' in found:
             requests.append('vocoder')
         
         # Arrangement requests
-        if 'buildup' in request_lower or 'build' in request_lower:
+        if 'buildup' in found or 'build' in found:
             requests.append('buildup')
-        if 'drop' in request_lower:
+        if 'drop' in found:
             requests.append('drop')
-        if 'transition' in request_lower:
+        if 'transition' in found:
             requests.append('transition')
         
         # Processing requests
-        if 'glitch' in request_lower:
+        if 'glitch' in found:
             requests.append('glitch')
-        if 'vinyl' in request_lower:
+        if 'vinyl' in found:
             requests.append('vinyl')
-        if 'time stretch' in request_lower:
+        if 'time stretch' in found:
             requests.append('time_stretch')
-        if 'pitch shift' in request_lower:
+        if 'pitch shift' in found:
             requests.append('pitch_shift')
         
         return requests
     
-    def _extract_structure(self, request: str) -> List[Dict]:
-        """Extract song structure from request"""
-        structure = []
-        
-        # Default EDM structure
-        sections = [
-            ('intro', 8),
-            ('buildup', 8),
-            ('drop', 16),
-            ('breakdown', 8),
-            ('buildup', 8),
-            ('drop', 16),
-            ('outro', 8)
-        ]
-        
-        for section, bars in sections:
-            if section in request.lower():
-                structure.append({'section': section, 'bars': bars})
-        
-        return structure if structure else [{'section': s, 'bars': b} for s, b in sections]
+    def _find_triggers(self, request_lower: str) -> Set[str]:
+        """Set of SPECIFIC_REQUEST_TRIGGERS occurring in the request"""
+        if HAS_AHOCORASICK:
+            return {trigger for _, trigger in TRIGGER_AUTOMATON.iter(request_lower)}
+        return {trigger for trigger in SPECIFIC_REQUEST_TRIGGERS if trigger in request_lower}
+    
+    def _extract_structure(self, request_lower: str) -> List[Dict]:
+        """Extract song structure from the lowercased request"""
+        sections = [entry for entry in DEFAULT_STRUCTURE if entry['section'] in request_lower]
+        
+        # Hand out copies so intents never share the module-level entries
+        return [dict(entry) for entry in (sections or DEFAULT_STRUCTURE)]
     
-    def _extract_mixing_params(self, request: str) -> Dict[str, Any]:
-        """Extract mixing parameters"""
+    def _extract_mixing_params(self, request_lower: str, tokens: FrozenSet[str]) -> Dict[str, Any]:
+        """Extract mixing parameters from the lowercased request and its words"""
         params = {}
         
-        if 'sidechain' in request.lower():
+        if not KEYWORD_WORDS['sidechain'].isdisjoint(tokens):
             params['sidechain'] = {
                 'source': 'kick',
                 'targets': ['bass', 'pad'],
                 'amount': 0.5
             }
         
-        if 'eq' in request.lower():
+        if not KEYWORD_WORDS['eq'].isdisjoint(tokens):
             params['eq'] = {
-                'bright': 'bright' in request.lower(),
-                'warm': 'warm' in request.lower(),
-                'clean': 'clean' in request.lower()
+                'bright': 'bright' in request_lower,
+                'warm': 'warm' in request_lower,
+                'clean': 'clean' in request_lower
             }
         
-        if 'compress' in request.lower():
+        if not KEYWORD_WORDS['compress'].isdisjoint(tokens):
             params['compression'] = {
-                'heavy': 'heavy' in request.lower(),
-                'gentle': 'gentle' in request.lower(),
-                'parallel': 'parallel' in request.lower()
+                'heavy': 'heavy' in request_lower,
+                'gentle': 'gentle' in request_lower,
+                'parallel': 'parallel' in request_lower
             }
         
         return params
     
-    def _extract_automation_params(self, request: str) -> List[Dict]:
-        """Extract automation parameters"""
+    def _extract_automation_params(self, request_lower: str, tokens: FrozenSet[str]) -> List[Dict]:
+        """Extract automation parameters from the lowercased request and its words"""
         automations = []
         
-        if 'filter' in request.lower() and 'sweep' in request.lower():
+        if 'filter' in request_lower and not KEYWORD_WORDS['sweep'].isdisjoint(tokens):
             automations.append({
                 'parameter': 'filter_cutoff',
                 'curve': 'exponential',
                 'range': [200, 15000]
             })
         
-        if 'volume' in request.lower() and 'fade' in request.lower():
+        if 'volume' in request_lower and 'fade' in request_lower:
             automations.append({
                 'parameter': 'volume',
                 'curve': 'linear',
-                'range': [100, 0] if 'out' in request.lower() else [0, 100]
+                'range': [100, 0] if 'out' in tokens else [0, 100]
             })
         
-        if 'pan' in request.lower():
+        if not KEYWORD_WORDS['pan'].isdisjoint(tokens):
             automations.append({
                 'parameter': 'panning',
                 'curve': 'sine',
@@ -258,27 +440,7 @@ class GPT5ComprehensiveBrain:
     
     def execute_production_request(self, intent: ProductionIntent) -> str:
         """Execute any production request"""
-        
-        if intent.request_type == ProductionRequest.CREATE:
-            return self._execute_create(intent)
-        elif intent.request_type == ProductionRequest.MIX:
-            return self._execute_mix(intent)
-        elif intent.request_type == ProductionRequest.MASTER:
-            return self._execute_master(intent)
-        elif intent.request_type == ProductionRequest.ARRANGE:
-            return self._execute_arrange(intent)
-        elif intent.request_type == ProductionRequest.DESIGN:
-            return self._execute_sound_design(intent)
-        elif intent.request_type == ProductionRequest.AUTOMATE:
-            return self._execute_automation(intent)
-        elif intent.request_type == ProductionRequest.PROCESS:
-            return self._execute_processing(intent)
-        elif intent.request_type == ProductionRequest.EFFECT:
-            return self._execute_effects(intent)
-        elif intent.request_type == ProductionRequest.ENHANCE:
-            return self._execute_enhance(intent)
-        else:
-            return self._execute_create(intent)
+        return self._executors.get(intent.request_type, self._execute_create)(intent)
     
     def _execute_create(self, intent: ProductionIntent) -> str:
         """Create complete track"""
@@ -293,9 +455,12 @@ class GPT5ComprehensiveBrain:
         
         return project
     
+    @_saves_as('mixed')
     def _execute_mix(self, intent: ProductionIntent) -> str:
         """Execute mixing requests"""
         
+        tracks = None  # Track index, taken only once a step needs it
+        
         if intent.mixing:
             # Apply sidechain
             if 'sidechain' in intent.mixing:
@@ -308,71 +473,74 @@ class GPT5ComprehensiveBrain:
             if 'eq' in intent.mixing:
                 eq = intent.mixing['eq']
                 curve = 'bright' if eq.get('bright') else 'warm' if eq.get('warm') else 'neutral'
-                for track in self.controller.root.findall('.//track'):
-                    track_name = track.get('name')
-                    if track_name:
-                        self.production_system.mixing.apply_eq_curve(track_name, curve)
+                tracks = self._track_refs()
+                for track in tracks:
+                    if track.name:
+                        self.production_system.mixing.apply_eq_curve(track.name, curve)
             
             # Apply compression
             if 'compression' in intent.mixing:
                 comp = intent.mixing['compression']
                 if comp.get('parallel'):
-                    for track in self.controller.root.findall('.//track'):
-                        track_name = track.get('name')
-                        if track_name and 'drum' in track_name.lower():
-                            self.production_system.mixing.apply_parallel_compression(track_name, 0.5)
-        
-        # Setup bus routing
-        bus_config = {
-            'drums': [t.get('name') for t in self.controller.root.findall('.//track') 
-                     if 'drum' in t.get('name', '').lower() or 'kick' in t.get('name', '').lower()],
-            'bass': [t.get('name') for t in self.controller.root.findall('.//track')
-                    if 'bass' in t.get('name', '').lower()],
-            'synths': [t.get('name') for t in self.controller.root.findall('.//track')
-                      if 'lead' in t.get('name', '').lower() or 'pad' in t.get('name', '').lower()]
-        }
-        self.production_system.mixing.setup_bus_routing(bus_config)
-        
-        # Save
-        import time
-        filename = f"mixed_{int(time.time())}.mmp"
-        self.controller.save_project(filename)
-        return filename
+                    if tracks is None:
+                        tracks = self._track_refs()
+                    for track in tracks:
+                        if 'drum' in track.name_lower:
+                            self.production_system.mixing.apply_parallel_compression(track.name, 0.5)
+                    
+                    # Parallel compression adds tracks, which get routed too
+                    tracks = None
+        
+        # Setup bus routing when asked for, bucketing the tracks in one pass
+        if 'bus_routing' in intent.specific_requests:
+            if tracks is None:
+                tracks = self._track_refs()
+            bus_config = {'drums': [], 'bass': [], 'synths': []}
+            for track in tracks:
+                if 'drum' in track.name_lower or 'kick' in track.name_lower:
+                    bus_config['drums'].append(track.name)
+                if 'bass' in track.name_lower:
+                    bus_config['bass'].append(track.name)
+                if 'lead' in track.name_lower or 'pad' in track.name_lower:
+                    bus_config['synths'].append(track.name)
+            self.production_system.mixing.setup_bus_routing(bus_config)
     
+    def _track_refs(self) -> List[TrackRef]:
+        """Index the project's tracks in one walk, reading each name once.
+        
+        The index is a snapshot: take a new one after adding tracks."""
+        refs = []
+        for track in self.controller.root.iter('track'):
+            name = track.get('name', '')
+            refs.append(TrackRef(track, name, name.lower()))
+        return refs
+    
+    @_saves_as('mastered')
     def _execute_master(self, intent: ProductionIntent) -> str:
         """Execute mastering"""
         
         genre = intent.genre or 'electronic'
         self.production_system.mixing.setup_master_chain(genre)
-        
-        # Save
-        import time
-        filename = f"mastered_{int(time.time())}.mmp"
-        self.controller.save_project(filename)
-        return filename
     
+    @_saves_as('arranged')
     def _execute_arrange(self, intent: ProductionIntent) -> str:
         """Execute arrangement"""
         
         if intent.structure:
             arrangement = self.production_system.arrangement.create_song_structure(intent.structure)
             
-            # Add transitions
+            # Add transitions at the end of each section (running total of ticks)
+            ends = list(itertools.accumulate(s['bars'] * 48 for s in intent.structure))
             for i in range(len(intent.structure) - 1):
                 from_section = intent.structure[i]['section']
                 to_section = intent.structure[i + 1]['section']
-                position = sum(s['bars'] * 48 for s in intent.structure[:i+1])
+                position = ends[i]
                 
                 self.production_system.arrangement.create_transition(
                     from_section, to_section, position
                 )
-        
-        # Save
-        import time
-        filename = f"arranged_{int(time.time())}.mmp"
-        self.controller.save_project(filename)
-        return filename
     
+    @_saves_as('sound_designed')
     def _execute_sound_design(self, intent: ProductionIntent) -> str:
         """Execute sound design requests"""
         
@@ -385,60 +553,48 @@ class GPT5ComprehensiveBrain:
                 self.production_system.sound_design.create_fm_synthesis('FM_Lead')
             elif request == 'vocoder':
                 self.production_system.sound_design.create_vocoder('Synth', 'Vocal')
-        
-        # Save
-        import time
-        filename = f"sound_designed_{int(time.time())}.mmp"
-        self.controller.save_project(filename)
-        return filename
     
+    @_saves_as('automated')
     def _execute_automation(self, intent: ProductionIntent) -> str:
         """Execute automation requests"""
         
         if intent.automation:
+            tracks = self._track_refs()
             for auto in intent.automation:
-                # Apply to all relevant tracks
-                for track in self.controller.root.findall('.//track'):
-                    track_name = track.get('name')
-                    if track_name:
+                # Apply to all relevant tracks: every named track, or only
+                # those whose name contains the entry's optional 'target'
+                target = auto.get('target', '').lower()
+                for track in tracks:
+                    if track.name and target in track.name_lower:
                         self.production_system.automation.create_automation_curve(
-                            track_name,
+                            track.name,
                             auto['parameter'],
                             auto['curve'],
                             [(0, auto['range'][0]), (192, auto['range'][1])]
                         )
-        
-        # Save
-        import time
-        filename = f"automated_{int(time.time())}.mmp"
-        self.controller.save_project(filename)
-        return filename
     
+    @_saves_as('processed')
     def _execute_processing(self, intent: ProductionIntent) -> str:
         """Execute audio processing requests"""
         
         for request in intent.specific_requests:
             if request == 'glitch':
-                for track in self.controller.root.findall('.//track'):
-                    if 'drum' in track.get('name', '').lower():
+                for track in self._track_refs():
+                    if 'drum' in track.name_lower:
                         self.production_system.audio_processing.create_glitch_effects(
-                            track.get('name'), 'stutter'
+                            track.name, 'stutter'
                         )
             elif request == 'vinyl':
                 self.production_system.audio_processing.apply_vinyl_simulation('Master', 0.5)
             elif request == 'time_stretch':
-                # Apply to samples
-                for track in self.controller.root.findall('.//track[@type="2"]'):
+                # Apply to samples (sample tracks are type 2)
+                samples = [t for t in self.controller.root.iter('track') if t.get('type') == '2']
+                for track in samples:
                     self.production_system.audio_processing.time_stretch(
                         track.get('name'), 1.2, True
                     )
-        
-        # Save
-        import time
-        filename = f"processed_{int(time.time())}.mmp"
-        self.controller.save_project(filename)
-        return filename
     
+    @_saves_as('effected')
     def _execute_effects(self, intent: ProductionIntent) -> str:
         """Execute effect requests"""
         
@@ -451,12 +607,6 @@ class GPT5ComprehensiveBrain:
                 self.production_system.effects.create_multiband_distortion('Bass', 0.2, 0.5, 0.3)
             elif request == 'space_echo':
                 self.production_system.effects.create_space_echo('Lead')
-        
-        # Save
-        import time
-        filename = f"effected_{int(time.time())}.mmp"
-        self.controller.save_project(filename)
-        return filename
     
     def _execute_enhance(self, intent: ProductionIntent) -> str:
         """Enhance existing project"""
@@ -467,33 +617,28 @@ class GPT5ComprehensiveBrain:
     
     def _apply_specific_request(self, request: str):
         """Apply a specific production request"""
-        
-        if request == 'sidechain_compression':
-            self.production_system.mixing.apply_sidechain_compression('Kick', ['Bass', 'Pad'])
-        elif request == 'buildup':
-            self.production_system.arrangement.create_buildup(8, 8)
-        elif request == 'drop':
-            self.production_system.arrangement.create_drop(16)
-        # Add more as needed
+        action = self._request_actions.get(request)
+        if action:
+            action()
     
     def process_natural_language(self, request: str) -> str:
         """
         Main entry point for natural language production requests
         """
         
-        print(f"Processing request: {request}")
+        logger.info("Processing request: %s", request)
         
         # Interpret the request
         intent = self.interpret_production_request(request)
-        print(f"Intent: {intent.request_type.value}")
+        logger.info("Intent: %s", intent.request_type.value)
         
-        if intent.specific_requests:
-            print(f"Specific requests: {', '.join(intent.specific_requests)}")
+        if intent.specific_requests and logger.isEnabledFor(logging.INFO):
+            logger.info("Specific requests: %s", ', '.join(intent.specific_requests))
         
         # Execute the production
         result = self.execute_production_request(intent)
         
-        print(f"Production complete: {result}")
+        logger.info("Production complete: %s", result)
         return result
 
 
@@ -540,4 +685,5 @@ def demonstrate_comprehensive_capabilities():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
     demonstrate_comprehensive_capabilities()
\ No newline at end of file
@@ -6,16 +6,113 @@ Analyzes existing project context before making any changes, similar to Cursor's
 
 import os
 import sys
+import copy
 import json
+import math
+import re
+import time
+from array import array
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, FrozenSet, List, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass
+from collections import OrderedDict
+from functools import cached_property
 from enum import Enum
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from lmms_ai_brain import LMMSAIBrain
 from lmms_complete_controller import LMMSCompleteController
 
+# Pitch classes of the keys the analyzer detects; ties go to the earlier key
+KEY_SIGNATURES = {
+    'C': (0, 2, 4, 5, 7, 9, 11),  # C major
+    'Am': (0, 2, 3, 5, 7, 8, 10),  # A minor
+    'G': (0, 2, 4, 6, 7, 9, 11),   # G major
+    'Em': (0, 2, 3, 6, 7, 8, 10),  # E minor
+    'D': (1, 2, 4, 6, 7, 9, 11),   # D major
+    'Bm': (1, 2, 3, 6, 7, 8, 10),  # B minor
+}
+KEY_NAMES = tuple(KEY_SIGNATURES)
+
+# Genre for each tempo from 0 to 180 BPM; faster tempos are 'electronic'
+TEMPO_GENRES = tuple(
+    'ambient' if bpm < 100 else
+    'house' if 120 <= bpm < 128 else
+    'techno' if 128 <= bpm <= 135 else
+    'dubstep' if 140 <= bpm <= 150 else
+    'dnb' if 170 <= bpm <= 180 else
+    'electronic'
+    for bpm in range(181)
+)
+
+# Tempo genres refined by keywords found in the tracks: genre -> (refined, keywords)
+GENRE_REFINEMENTS = {
+    'dubstep': ('trap', ('trap',)),
+    'techno': ('acid', ('acid', '303')),
+}
+
+# Effect children already reported as effect fields, not parameters
+EFFECT_FIELD_TAGS = frozenset({'name', 'wet', 'autoquit'})
+
+# Most project file analyses remembered per analyzer
+ANALYSIS_CACHE_SIZE = 16
+
+# Words of a lowercased request
+WORD_PATTERN = re.compile(r"[a-z0-9_]+")
+
+# Request keywords, with the inflections users write
+ADD_WORDS = frozenset({'add', 'adds', 'adding', 'more'})
+BASS_WORDS = frozenset({'bass', 'basses', 'bassline', 'basslines'})
+LEAD_WORDS = frozenset({'lead', 'leads'})
+HEAVIER_WORDS = frozenset({'heavier', 'harder'})
+FASTER_WORDS = frozenset({'faster'})
+VARIATION_WORDS = frozenset({'variation', 'variations'})
+# Pattern changes also follow 'different'; alternatives only 'variation'
+PATTERN_CHANGE_WORDS = VARIATION_WORDS | {'different'}
+
+
+def _request_words(request: str) -> FrozenSet[str]:
+    """Set of the lowercase words in a request"""
+    return frozenset(WORD_PATTERN.findall(request.lower()))
+
+# Key-by-pitch-class membership matrix: scores = KEY_MASKS @ pitch histogram
+if HAS_NUMPY:
+    KEY_MASKS = np.zeros((len(KEY_NAMES), 12), dtype=np.int64)
+    for row, scale in enumerate(KEY_SIGNATURES.values()):
+        KEY_MASKS[row, list(scale)] = 1
+
+
+def _best_key_index(pitches, masks):
+    """Row of masks covering the most pitches; the histogram and scores in one pass"""
+    histogram = np.zeros(12, dtype=np.int64)
+    for pitch in pitches:
+        histogram[pitch % 12] += 1
+        
+    best, best_score = 0, -1
+    for key in range(masks.shape[0]):
+        score = 0
+        for pitch_class in range(12):
+            score += masks[key, pitch_class] * histogram[pitch_class]
+        if score > best_score:
+            best, best_score = key, score
+    return best
+
+
+if HAS_NUMPY and HAS_NUMBA:
+    _best_key_index = njit(cache=True)(_best_key_index)
+
 
 class ContextAnalysisMode(Enum):
     """Different modes of context analysis"""
@@ -39,6 +136,217 @@ class ProjectContext:
     style_characteristics: Dict[str, Any]
     structure: Dict[str, Any]
     suggestions: List[str]
+    
+    @cached_property
+    def summary(self) -> str:
+        """One-line summary, built once; contexts are read-only once analyzed"""
+        summary_parts = []
+        
+        if self.tempo:
+            summary_parts.append(f"{self.tempo} BPM")
+            
+        if self.genre:
+            summary_parts.append(f"{self.genre} genre")
+            
+        if self.key:
+            summary_parts.append(f"Key: {self.key}")
+            
+        if self.tracks:
+            summary_parts.append(f"{len(self.tracks)} tracks")
+            
+        if self.effects:
+            summary_parts.append(f"{len(self.effects)} effects")
+            
+        style = self.style_characteristics
+        if style:
+            summary_parts.append(f"{style.get('energy', 'medium')} energy")
+            summary_parts.append(f"{style.get('production_style', 'clean')} production")
+            
+        return ", ".join(summary_parts) if summary_parts else "Empty project"
+    
+    @cached_property
+    def track_names(self) -> str:
+        """Lowercased track names, one per line, so one substring test covers every track"""
+        return '\n'.join(t.get('name', '').lower() for t in self.tracks)
+    
+    @cached_property
+    def track_text(self) -> str:
+        """Lowercased text of each track's full details, one per line"""
+        return '\n'.join(str(t).lower() for t in self.tracks)
+
+
+class ProjectScan:
+    """
+    Parser target that analyzes a project while its tags stream past
+    Files are fed through ET.XMLParser(target=...) so no element tree is
+    built; an in-memory tree is replayed with feed_tree(). Like a .// search,
+    an open track, pattern or automation pattern also takes in what nests in
+    its nested ones (e.g. a beat track and the tracks inside it).
+    """
+    
+    def __init__(self):
+        self.bpms: List[str] = []
+        self.tracks: List[Dict[str, Any]] = []
+        self.patterns: List[Optional[Dict[str, Any]]] = []  # None for patterns without notes
+        self.pitches = array('q')  # Note pitches of every open pattern, for key detection
+        self.effects: List[Dict[str, Any]] = []
+        self.automation: List[Dict[str, Any]] = []
+        
+        self._tags: List[str] = []  # Open elements, outermost first
+        self._open_tracks: List[Dict[str, Any]] = []
+        self._open_patterns: List[list] = []  # [attrib, notes, velocity total, lowest, highest, index]
+        self._open_effects: List[Dict[str, Any]] = []
+        self._open_automation: List[Dict[str, Any]] = []
+        
+        # Effect parameter waiting for its text: (parameters, tag)
+        self._pending_parameter: Optional[Tuple[Dict[str, Any], str]] = None
+        self._text: List[str] = []
+        
+    def start(self, tag: str, attrib: Dict[str, str]):
+        self._flush_parameter()
+        parent = self._tags[-1] if self._tags else None
+        self._tags.append(tag)
+        
+        # Direct children of an effect are its parameters: value, else text
+        if parent == 'effect' and tag not in EFFECT_FIELD_TAGS:
+            parameters = self._open_effects[-1]['parameters']
+            value = attrib.get('value')
+            if value is not None:
+                parameters[tag] = value
+            else:
+                self._pending_parameter = (parameters, tag)
+        
+        if tag == 'note':
+            if self._open_patterns:
+                pitch = int(attrib.get('key', 0))
+                velocity = int(attrib.get('vol', 100))
+                for pattern in self._open_patterns:
+                    self.pitches.append(pitch)
+                    pattern[1] += 1
+                    pattern[2] += velocity
+                    if pitch < pattern[3]:
+                        pattern[3] = pitch
+                    if pitch > pattern[4]:
+                        pattern[4] = pitch
+                    
+        elif tag == 'object':
+            if self._open_automation:
+                pos = int(attrib.get('pos', 0))
+                value = float(attrib.get('value', 0))
+                for auto in self._open_automation:
+                    auto['points'].append({'pos': pos, 'value': value})
+                    
+        elif tag == 'pattern':
+            if self._open_tracks:
+                name = attrib.get('name', 'Unknown')
+                pos = int(attrib.get('pos', 0))
+                length = int(attrib.get('len', 192))
+                for track in self._open_tracks:
+                    track['patterns'].append({'name': name, 'pos': pos, 'len': length})
+            self._open_patterns.append([attrib, 0, 0, math.inf, -math.inf, len(self.patterns)])
+            self.patterns.append(None)
+            
+        elif tag == 'instrument':
+            name = attrib.get('name', 'Unknown')
+            for track in self._open_tracks:
+                track['instruments'].append(name)
+                
+        elif tag == 'effect':
+            name = attrib.get('name', 'Unknown')
+            for track in self._open_tracks:
+                track['effects'].append(name)
+            effect = {
+                'name': name,
+                'wet': float(attrib.get('wet', 1.0)),
+                'autoquit': attrib.get('autoquit', '1') == '1',
+                'parameters': {}
+            }
+            self.effects.append(effect)
+            self._open_effects.append(effect)
+            
+        elif tag == 'track':
+            track = {
+                'name': attrib.get('name', 'Unknown'),
+                'type': attrib.get('type', 'instrument'),
+                'muted': attrib.get('muted', '0') == '1',
+                'solo': attrib.get('solo', '0') == '1',
+                'volume': float(attrib.get('vol', '100')),
+                'pan': float(attrib.get('pan', '0')),
+                'instruments': [],
+                'effects': [],
+                'patterns': []
+            }
+            self.tracks.append(track)
+            self._open_tracks.append(track)
+            
+        elif tag == 'automationpattern':
+            auto = {
+                'name': attrib.get('name', 'Unknown'),
+                'pos': int(attrib.get('pos', 0)),
+                'len': int(attrib.get('len', 192)),
+                'object_id': attrib.get('object-id', ''),
+                'points': []
+            }
+            self.automation.append(auto)
+            self._open_automation.append(auto)
+            
+        elif tag == 'head':
+            self.bpms.append(attrib.get('bpm', 140))
+            
+    def end(self, tag: str):
+        self._flush_parameter()
+        self._tags.pop()
+        
+        if tag == 'pattern':
+            attrib, note_count, velocity_total, lowest, highest, index = self._open_patterns.pop()
+            if note_count:
+                self.patterns[index] = self._pattern_info(attrib, note_count, velocity_total, lowest, highest)
+        elif tag == 'track':
+            self._open_tracks.pop()
+        elif tag == 'effect':
+            self._open_effects.pop()
+        elif tag == 'automationpattern':
+            self._open_automation.pop()
+            
+    def data(self, text: str):
+        if self._pending_parameter is not None:
+            self._text.append(text)
+            
+    def close(self) -> 'ProjectScan':
+        return self
+    
+    def feed_tree(self, element: ET.Element):
+        """Replay an in-memory element and its subtree through the target"""
+        self.start(element.tag, element.attrib)
+        if element.text is not None:
+            self.data(element.text)
+        for child in element:
+            self.feed_tree(child)
+        self.end(element.tag)
+        
+    def _flush_parameter(self):
+        """Store the pending effect parameter once its text is complete"""
+        if self._pending_parameter is not None:
+            parameters, tag = self._pending_parameter
+            parameters[tag] = ''.join(self._text) if self._text else None
+            self._pending_parameter = None
+            self._text.clear()
+            
+    @staticmethod
+    def _pattern_info(attrib: Dict[str, str], note_count: int, velocity_total: int,
+                      lowest: int, highest: int) -> Dict[str, Any]:
+        """Summarize the musical content of a pattern with notes"""
+        length = int(attrib.get('len', 192))
+        
+        return {
+            'name': attrib.get('name', 'Unknown'),
+            'type': attrib.get('type', 'beat'),
+            'length': length,
+            'note_count': note_count,
+            'pitch_range': (lowest, highest),
+            'avg_velocity': velocity_total / note_count,
+            'density': note_count / (length / 48)  # Notes per bar
+        }
 
 
 class ContextAnalyzer:
@@ -47,53 +355,94 @@ class ContextAnalyzer:
     def __init__(self):
         self.controller = LMMSCompleteController()
         
-    def analyze_project(self, project_file: str = None, mode: ContextAnalysisMode = ContextAnalysisMode.FULL) -> ProjectContext:
+        # Project file analyses keyed by (path, mtime, size, mode), oldest first
+        self._analysis_cache: 'OrderedDict[tuple, ProjectContext]' = OrderedDict()
+        
+    def analyze_project(self, project_file: str = None, mode: ContextAnalysisMode = ContextAnalysisMode.FULL,
+                        root: Optional[ET.Element] = None) -> ProjectContext:
         """
         Analyze the current project context
         Similar to how Cursor analyzes surrounding code
+        An in-memory project root, when given, is analyzed instead of any file
         """
         
-        if project_file and os.path.exists(project_file):
-            tree = ET.parse(project_file)
-            root = tree.getroot()
+        cache_key = None
+        if root is not None:
+            scan = ProjectScan()
+            scan.feed_tree(root)
+        elif project_file and os.path.exists(project_file):
+            # Reuse the analysis while the file is unchanged on disk
+            stat = os.stat(project_file)
+            cache_key = (os.path.abspath(project_file), stat.st_mtime_ns, stat.st_size, mode)
+            context = self._analysis_cache.get(cache_key)
+            if context is not None:
+                self._analysis_cache.move_to_end(cache_key)
+                return copy.deepcopy(context)
+            scan = self._scan_file(project_file)
         else:
             # Use current project in controller
-            root = self.controller.root
+            scan = ProjectScan()
+            scan.feed_tree(self.controller.root)
+        
+        tempo = self._get_tempo(scan.bpms)
+        tracks = scan.tracks
+        patterns = [info for info in scan.patterns if info is not None]
+        effects = scan.effects
             
         context = ProjectContext(
-            tempo=self._get_tempo(root),
-            key=self._detect_key(root),
-            genre=self._detect_genre(root),
-            tracks=self._analyze_tracks(root),
-            patterns=self._analyze_patterns(root),
-            effects=self._analyze_effects(root),
-            automation=self._analyze_automation(root),
-            style_characteristics=self._analyze_style(root),
-            structure=self._analyze_structure(root),
+            tempo=tempo,
+            key=self._detect_key(scan.pitches),
+            genre=None,
+            tracks=tracks,
+            patterns=patterns,
+            effects=effects,
+            automation=scan.automation,
+            style_characteristics=self._analyze_style(tempo, tracks, patterns, effects),
+            structure=self._analyze_structure(patterns),
             suggestions=[]
         )
         
+        context.genre = self._detect_genre(context)
+        
         # Generate context-aware suggestions
         context.suggestions = self._generate_suggestions(context, mode)
         
-        return context
+        if cache_key is None:
+            return context
+            
+        self._analysis_cache[cache_key] = context
+        if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+            
+        # Callers get their own deep copy, so nothing they change reaches the cache
+        return copy.deepcopy(context)
     
-    def _get_tempo(self, root: ET.Element) -> int:
+    def _scan_file(self, project_file: str) -> ProjectScan:
+        """Analyze a project file as it is parsed, without building its tree"""
+        scan = ProjectScan()
+        ET.parse(project_file, ET.XMLParser(target=scan))
+        return scan
+    
+    def _get_tempo(self, bpms: List[str]) -> int:
         """Extract tempo from project"""
-        head = root.find('.//head')
-        if head is not None:
-            return int(head.get('bpm', 140))
+        if bpms:
+            return int(bpms[0])
         return 140
     
-    def _detect_key(self, root: ET.Element) -> Optional[str]:
+    def _detect_key(self, pitches: Sequence[int]) -> Optional[str]:
         """Detect the musical key by analyzing note patterns"""
-        all_notes = []
-        
-        # Collect all notes from patterns
-        for pattern in root.findall('.//pattern'):
-            for note in pattern.findall('.//note'):
-                pitch = int(note.get('key', 0))
-                all_notes.append(pitch % 12)  # Reduce to chromatic scale
+        if HAS_NUMPY:
+            if not len(pitches):
+                return None
+            pitch_array = np.asarray(pitches, dtype=np.int64)
+            if HAS_NUMBA:
+                return KEY_NAMES[_best_key_index(pitch_array, KEY_MASKS)]
+                
+            # Pitch-class histogram scored against every key in one product
+            scores = KEY_MASKS @ np.bincount(pitch_array % 12, minlength=12)
+            return KEY_NAMES[int(scores.argmax())]
+            
+        all_notes = [pitch % 12 for pitch in pitches]  # Reduce to chromatic scale
         
         if not all_notes:
             return None
@@ -102,22 +451,12 @@ class ContextAnalyzer:
         note_freq = {}
         for note in all_notes:
             note_freq[note] = note_freq.get(note, 0) + 1
-            
-        # Map to likely keys based on common notes
-        key_signatures = {
-            'C': [0, 2, 4, 5, 7, 9, 11],  # C major
-            'Am': [0, 2, 3, 5, 7, 8, 10],  # A minor
-            'G': [0, 2, 4, 6, 7, 9, 11],   # G major
-            'Em': [0, 2, 3, 6, 7, 8, 10],  # E minor
-            'D': [1, 2, 4, 6, 7, 9, 11],   # D major
-            'Bm': [1, 2, 3, 6, 7, 8, 10],  # B minor
-        }
         
         # Find best matching key
         best_key = None
         best_score = 0
         
-        for key, notes in key_signatures.items():
+        for key, notes in KEY_SIGNATURES.items():
             score = sum(note_freq.get(n, 0) for n in notes)
             if score > best_score:
                 best_score = score
@@ -125,141 +464,19 @@ class ContextAnalyzer:
                 
         return best_key
     
-    def _detect_genre(self, root: ET.Element) -> Optional[str]:
+    def _detect_genre(self, context: ProjectContext) -> Optional[str]:
         """Detect genre based on tempo, instruments, and patterns"""
-        tempo = self._get_tempo(root)
-        tracks = self._analyze_tracks(root)
-        
-        # Simple genre detection rules
-        if 170 <= tempo <= 180:
-            return "dnb"
-        elif 140 <= tempo <= 150:
-            if any('trap' in str(t).lower() for t in tracks):
-                return "trap"
-            return "dubstep"
-        elif 128 <= tempo <= 135:
-            if any('acid' in str(t).lower() or '303' in str(t).lower() for t in tracks):
-                return "acid"
-            return "techno"
-        elif 120 <= tempo <= 128:
-            return "house"
-        elif tempo < 100:
-            return "ambient"
-        else:
-            return "electronic"
-    
-    def _analyze_tracks(self, root: ET.Element) -> List[Dict[str, Any]]:
-        """Analyze all tracks in the project"""
-        tracks = []
-        
-        for track in root.findall('.//track'):
-            track_info = {
-                'name': track.get('name', 'Unknown'),
-                'type': track.get('type', 'instrument'),
-                'muted': track.get('muted', '0') == '1',
-                'solo': track.get('solo', '0') == '1',
-                'volume': float(track.get('vol', '100')),
-                'pan': float(track.get('pan', '0')),
-                'instruments': [],
-                'effects': [],
-                'patterns': []
-            }
-            
-            # Get instrument info
-            for inst in track.findall('.//instrument'):
-                track_info['instruments'].append(inst.get('name', 'Unknown'))
-            
-            # Get effect info
-            for effect in track.findall('.//effect'):
-                track_info['effects'].append(effect.get('name', 'Unknown'))
-                
-            # Get pattern info
-            for pattern in track.findall('.//pattern'):
-                track_info['patterns'].append({
-                    'name': pattern.get('name', 'Unknown'),
-                    'pos': int(pattern.get('pos', 0)),
-                    'len': int(pattern.get('len', 192))
-                })
-            
-            tracks.append(track_info)
-            
-        return tracks
-    
-    def _analyze_patterns(self, root: ET.Element) -> List[Dict[str, Any]]:
-        """Analyze patterns to understand musical content"""
-        patterns = []
+        tempo = context.tempo
+        genre = TEMPO_GENRES[max(tempo, 0)] if tempo < len(TEMPO_GENRES) else 'electronic'
         
-        for pattern in root.findall('.//pattern'):
-            notes = pattern.findall('.//note')
-            
-            if notes:
-                pitches = [int(n.get('key', 0)) for n in notes]
-                velocities = [int(n.get('vol', 100)) for n in notes]
-                
-                pattern_info = {
-                    'name': pattern.get('name', 'Unknown'),
-                    'type': pattern.get('type', 'beat'),
-                    'length': int(pattern.get('len', 192)),
-                    'note_count': len(notes),
-                    'pitch_range': (min(pitches), max(pitches)) if pitches else (0, 0),
-                    'avg_velocity': sum(velocities) / len(velocities) if velocities else 0,
-                    'density': len(notes) / (int(pattern.get('len', 192)) / 48)  # Notes per bar
-                }
-                
-                patterns.append(pattern_info)
-                
-        return patterns
-    
-    def _analyze_effects(self, root: ET.Element) -> List[Dict[str, Any]]:
-        """Analyze effects used in the project"""
-        effects = []
-        
-        for effect in root.findall('.//effect'):
-            effect_info = {
-                'name': effect.get('name', 'Unknown'),
-                'wet': float(effect.get('wet', 1.0)),
-                'autoquit': effect.get('autoquit', '1') == '1',
-                'parameters': {}
-            }
-            
-            # Collect all effect parameters
-            for child in effect:
-                if child.tag not in ['name', 'wet', 'autoquit']:
-                    effect_info['parameters'][child.tag] = child.get('value', child.text)
-                    
-            effects.append(effect_info)
-            
-        return effects
-    
-    def _analyze_automation(self, root: ET.Element) -> List[Dict[str, Any]]:
-        """Analyze automation in the project"""
-        automation = []
-        
-        for auto in root.findall('.//automationpattern'):
-            auto_info = {
-                'name': auto.get('name', 'Unknown'),
-                'pos': int(auto.get('pos', 0)),
-                'len': int(auto.get('len', 192)),
-                'object_id': auto.get('object-id', ''),
-                'points': []
-            }
-            
-            # Get automation points
-            for point in auto.findall('.//object'):
-                auto_info['points'].append({
-                    'pos': int(point.get('pos', 0)),
-                    'value': float(point.get('value', 0))
-                })
-                
-            automation.append(auto_info)
-            
-        return automation
+        refinement = GENRE_REFINEMENTS.get(genre)
+        if refinement and any(keyword in context.track_text for keyword in refinement[1]):
+            return refinement[0]
+        return genre
     
-    def _analyze_style(self, root: ET.Element) -> Dict[str, Any]:
+    def _analyze_style(self, tempo: int, tracks: List[Dict[str, Any]],
+                       patterns: List[Dict[str, Any]], effects: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze the musical style characteristics"""
-        tracks = self._analyze_tracks(root)
-        patterns = self._analyze_patterns(root)
-        effects = self._analyze_effects(root)
         
         style = {
             'complexity': 'simple',
@@ -276,7 +493,6 @@ class ContextAnalyzer:
             style['complexity'] = 'moderate'
             
         # Energy based on tempo and note density
-        tempo = self._get_tempo(root)
         avg_density = sum(p.get('density', 0) for p in patterns) / len(patterns) if patterns else 0
         
         if tempo > 140 or avg_density > 8:
@@ -286,21 +502,22 @@ class ContextAnalyzer:
             
         # Production style based on effects
         effect_count = len(effects)
-        has_distortion = any('dist' in e.get('name', '').lower() for e in effects)
-        has_reverb = any('reverb' in e.get('name', '').lower() for e in effects)
         
-        if has_distortion and effect_count > 5:
+        # Lowercased effect names, one per line, read in one pass; only the
+        # heavy and atmospheric styles (more than 3 effects) look at them
+        effect_names = '\n'.join(e.get('name', '').lower() for e in effects) if effect_count > 3 else ''
+        
+        if effect_count > 5 and 'dist' in effect_names:
             style['production_style'] = 'heavy'
-        elif has_reverb and effect_count > 3:
+        elif effect_count > 3 and 'reverb' in effect_names:
             style['production_style'] = 'atmospheric'
         elif effect_count < 2:
             style['production_style'] = 'minimal'
             
         return style
     
-    def _analyze_structure(self, root: ET.Element) -> Dict[str, Any]:
+    def _analyze_structure(self, patterns: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze the song structure (intro, verse, chorus, etc.)"""
-        patterns = self._analyze_patterns(root)
         
         structure = {
             'total_bars': 0,
@@ -340,7 +557,7 @@ class ContextAnalyzer:
             suggestions.append("Add effects to enhance the sound (reverb, delay, compression)")
             
         if context.tempo and context.genre:
-            if context.genre == "house" and not any("kick" in t.get('name', '').lower() for t in context.tracks):
+            if context.genre == "house" and "kick" not in context.track_names:
                 suggestions.append("Add a 4/4 kick pattern for house music")
                 
         if context.style_characteristics.get('energy') == 'low' and context.genre in ['techno', 'dnb']:
@@ -352,6 +569,78 @@ class ContextAnalyzer:
         return suggestions
 
 
+def _add_requested_tracks(request_words: FrozenSet[str], context: ProjectContext,
+                          changes: Dict[str, Any]):
+    """Add the bass or lead a request asks for when the project has none"""
+    if not BASS_WORDS.isdisjoint(request_words) and 'bass' not in context.track_names:
+        changes['add_tracks'].append({
+            'name': 'Bass',
+            'type': 'bass',
+            'reason': 'No bass track found, adding as requested'
+        })
+        
+    if not LEAD_WORDS.isdisjoint(request_words) and 'lead' not in context.track_names:
+        changes['add_tracks'].append({
+            'name': 'Lead',
+            'type': 'lead',
+            'reason': 'No lead track found, adding as requested'
+        })
+
+
+def _make_heavier(request_words: FrozenSet[str], context: ProjectContext,
+                  changes: Dict[str, Any]):
+    """Distort the master and punch up the kicks"""
+    changes['add_effects'].append({
+        'effect': 'distortion',
+        'target': 'master',
+        'reason': 'Making sound heavier as requested'
+    })
+    
+    if 'kick' not in context.track_names:
+        return
+        
+    for track in context.tracks:
+        if 'kick' in track.get('name', '').lower():
+            changes['modify_tracks'].append({
+                'track': track['name'],
+                'changes': {'volume': 110, 'punch': 'increase'},
+                'reason': 'Increasing kick punch for heavier sound'
+            })
+
+
+def _raise_tempo(request_words: FrozenSet[str], context: ProjectContext,
+                 changes: Dict[str, Any]):
+    """Speed the project up by 20 BPM, up to 180"""
+    current_tempo = context.tempo
+    new_tempo = min(current_tempo + 20, 180)
+    changes['structural_changes'].append({
+        'type': 'tempo',
+        'from': current_tempo,
+        'to': new_tempo,
+        'reason': 'Increasing tempo as requested'
+    })
+
+
+def _vary_patterns(request_words: FrozenSet[str], context: ProjectContext,
+                   changes: Dict[str, Any]):
+    """Add variations to the first two patterns"""
+    for pattern in context.patterns[:2]:
+        changes['modify_patterns'].append({
+            'pattern': pattern['name'],
+            'modification': 'add_variation',
+            'reason': 'Adding variation as requested'
+        })
+
+
+# Change rules in the order they apply: (trigger words, rule)
+CHANGE_RULES = (
+    (ADD_WORDS, _add_requested_tracks),
+    (HEAVIER_WORDS, _make_heavier),
+    (FASTER_WORDS, _raise_tempo),
+    (PATTERN_CHANGE_WORDS, _vary_patterns),
+)
+
+
 class ContextAwareGPT5Interface:
     """
     GPT-5 interface that analyzes context before making changes
@@ -377,7 +666,7 @@ class ContextAwareGPT5Interface:
         print(f"Current context: {context_summary}")
         
         # Step 3: Determine what changes are needed
-        changes_needed = self._determine_changes(request, self.current_context)
+        changes_needed = self._determine_changes(_request_words(request), self.current_context)
         print(f"Changes needed: {changes_needed}")
         
         # Step 4: Apply changes intelligently
@@ -387,31 +676,9 @@ class ContextAwareGPT5Interface:
     
     def _summarize_context(self, context: ProjectContext) -> str:
         """Summarize the current project context"""
-        summary_parts = []
-        
-        if context.tempo:
-            summary_parts.append(f"{context.tempo} BPM")
-            
-        if context.genre:
-            summary_parts.append(f"{context.genre} genre")
-            
-        if context.key:
-            summary_parts.append(f"Key: {context.key}")
-            
-        if context.tracks:
-            summary_parts.append(f"{len(context.tracks)} tracks")
-            
-        if context.effects:
-            summary_parts.append(f"{len(context.effects)} effects")
-            
-        style = context.style_characteristics
-        if style:
-            summary_parts.append(f"{style.get('energy', 'medium')} energy")
-            summary_parts.append(f"{style.get('production_style', 'clean')} production")
-            
-        return ", ".join(summary_parts) if summary_parts else "Empty project"
+        return context.summary
     
-    def _determine_changes(self, request: str, context: ProjectContext) -> Dict[str, Any]:
+    def _determine_changes(self, request_words: FrozenSet[str], context: ProjectContext) -> Dict[str, Any]:
         """
         Determine what changes are needed based on request and context
         This is like Cursor's diff preview
@@ -426,60 +693,10 @@ class ContextAwareGPT5Interface:
             'structural_changes': []
         }
         
-        request_lower = request.lower()
-        
-        # Analyze request in context
-        if 'add' in request_lower or 'more' in request_lower:
-            # Adding to existing project
-            if 'bass' in request_lower and not any('bass' in t.get('name', '').lower() for t in context.tracks):
-                changes['add_tracks'].append({
-                    'name': 'Bass',
-                    'type': 'bass',
-                    'reason': 'No bass track found, adding as requested'
-                })
-                
-            if 'lead' in request_lower and not any('lead' in t.get('name', '').lower() for t in context.tracks):
-                changes['add_tracks'].append({
-                    'name': 'Lead',
-                    'type': 'lead',
-                    'reason': 'No lead track found, adding as requested'
-                })
-                
-        if 'heavier' in request_lower or 'harder' in request_lower:
-            # Modify existing to be heavier
-            changes['add_effects'].append({
-                'effect': 'distortion',
-                'target': 'master',
-                'reason': 'Making sound heavier as requested'
-            })
-            
-            for track in context.tracks:
-                if 'kick' in track.get('name', '').lower():
-                    changes['modify_tracks'].append({
-                        'track': track['name'],
-                        'changes': {'volume': 110, 'punch': 'increase'},
-                        'reason': 'Increasing kick punch for heavier sound'
-                    })
-                    
-        if 'faster' in request_lower:
-            # Tempo change needed
-            current_tempo = context.tempo
-            new_tempo = min(current_tempo + 20, 180)
-            changes['structural_changes'].append({
-                'type': 'tempo',
-                'from': current_tempo,
-                'to': new_tempo,
-                'reason': 'Increasing tempo as requested'
-            })
-            
-        if 'variation' in request_lower or 'different' in request_lower:
-            # Add variations to existing patterns
-            for pattern in context.patterns[:2]:  # Modify first 2 patterns
-                changes['modify_patterns'].append({
-                    'pattern': pattern['name'],
-                    'modification': 'add_variation',
-                    'reason': 'Adding variation as requested'
-                })
+        # Apply every rule the request asks for, in order
+        for words, rule in CHANGE_RULES:
+            if not words.isdisjoint(request_words):
+                rule(request_words, context, changes)
                 
         # Context-aware suggestions
         if not changes['add_tracks'] and not changes['modify_tracks'] and len(context.tracks) < 3:
@@ -536,12 +753,13 @@ class ContextAwareGPT5Interface:
                 result['changes_applied'].append(f"Added {effect['effect']}: {effect['reason']}")
                 
             # Save the project
-            project_file = self.brain.controller.save_project(f"context_aware_{int(time.time())}.mmp")
+            project_file = f"context_aware_{int(time.time())}.mmp"
+            self.brain.controller.save_project(project_file)
             result['project_file'] = project_file
             result['status'] = 'success'
             
-            # Generate new context summary
-            new_context = self.analyzer.analyze_project(project_file)
+            # Generate new context summary from the project still in memory
+            new_context = self.analyzer.analyze_project(root=self.brain.controller.root)
             result['context_after'] = self._summarize_context(new_context)
             
             # Warnings if needed
@@ -575,7 +793,7 @@ class ContextAwareGPT5Interface:
         if len(tracks) < 3:
             suggestions.append("Add more instrument layers for a fuller sound")
             
-        if not any('bass' in t.get('name', '').lower() for t in tracks):
+        if 'bass' not in self.current_context.track_names:
             suggestions.append("Add a bass line to provide low-end foundation")
             
         if len(effects) < 2:
@@ -586,11 +804,11 @@ class ContextAwareGPT5Interface:
             
         # Genre-specific suggestions
         if self.current_context.genre == 'techno':
-            if not any('acid' in str(t).lower() for t in tracks):
+            if 'acid' not in self.current_context.track_text:
                 suggestions.append("Add an acid line for classic techno sound")
                 
         elif self.current_context.genre == 'house':
-            if not any('pad' in str(t).lower() for t in tracks):
+            if 'pad' not in self.current_context.track_text:
                 suggestions.append("Add pads for atmospheric house vibes")
                 
         return suggestions[:5]  # Return top 5 suggestions
@@ -604,13 +822,14 @@ class ContextAwareGPT5Interface:
         if not self.current_context:
             self.current_context = self.analyzer.analyze_project()
             
-        changes = self._determine_changes(request, self.current_context)
+        request_words = _request_words(request)
+        changes = self._determine_changes(request_words, self.current_context)
         
         preview = {
             'current_state': self._summarize_context(self.current_context),
             'proposed_changes': changes,
             'impact': self._assess_impact(changes, self.current_context),
-            'alternatives': self._suggest_alternatives(request, self.current_context)
+            'alternatives': self._suggest_alternatives(request_words, self.current_context)
         }
         
         return preview
@@ -641,16 +860,16 @@ class ContextAwareGPT5Interface:
                     
         return impact
     
-    def _suggest_alternatives(self, request: str, context: ProjectContext) -> List[str]:
+    def _suggest_alternatives(self, request_words: FrozenSet[str], context: ProjectContext) -> List[str]:
         """Suggest alternative approaches"""
         
         alternatives = []
         
-        if 'heavier' in request.lower():
+        if 'heavier' in request_words:
             alternatives.append("Instead of adding distortion, try layering kicks for natural heaviness")
             alternatives.append("Consider using compression and EQ to achieve weight without distortion")
             
-        if 'variation' in request.lower():
+        if not VARIATION_WORDS.isdisjoint(request_words):
             alternatives.append("Add automation to existing elements for dynamic variation")
             alternatives.append("Use filter sweeps and effects automation instead of new patterns")
             
@@ -7,12 +7,13 @@ This interface allows GPT-5 to understand any musical request and create it inte
 import os
 import sys
 import json
+import asyncio
 from typing import Dict, List, Any, Optional
 import subprocess
 import time
 
 try:
-    import openai
+    from openai import OpenAI, AsyncOpenAI
     HAS_OPENAI = True
 except ImportError:
     HAS_OPENAI = False
@@ -22,6 +23,38 @@ from lmms_ai_brain import LMMSAIBrain, MusicalIntent, ProductionPlan
 from lmms_actions import Note
 from gpt5_context_aware import ContextAwareGPT5Interface, ContextAnalyzer, ProjectContext
 
+# Batch processing limits: requests in flight at once, and OpenAI calls per minute
+BATCH_CONCURRENCY = 10
+BATCH_REQUESTS_PER_MINUTE = 500
+
+MODIFICATION_WORDS = ('add', 'change', 'modify', 'make it', 'more', 'less',
+                      'heavier', 'lighter', 'faster', 'slower', 'variation')
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for async OpenAI calls
+    Holds up to one minute's worth of calls and refills continuously
+    """
+    
+    def __init__(self, max_requests_per_minute: int):
+        self.capacity = float(max_requests_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
 
 class GPT5MusicInterface:
     """
@@ -36,9 +69,10 @@ class GPT5MusicInterface:
         self.context_aware = context_aware
         self.context_interface = ContextAwareGPT5Interface(self.api_key) if context_aware else None
         self.current_project = None
+        self.client = None
         
         if self.api_key and HAS_OPENAI:
-            openai.api_key = self.api_key
+            self.client = OpenAI(api_key=self.api_key)
         elif self.api_key and not HAS_OPENAI:
             print("Warning: API key provided but OpenAI library not available")
             self.api_key = None
@@ -52,38 +86,9 @@ class GPT5MusicInterface:
         # Add to session history for context
         self.session_history.append({"role": "user", "request": request})
         
-        # Check if we should use context-aware processing
-        if self.context_aware and self.context_interface:
-            # Determine if this is a modification request or new creation
-            request_lower = request.lower()
-            is_modification = any(word in request_lower for word in [
-                'add', 'change', 'modify', 'make it', 'more', 'less', 
-                'heavier', 'lighter', 'faster', 'slower', 'variation'
-            ])
-            
-            if is_modification and self.current_project:
-                # Use context-aware processing for modifications
-                print("Analyzing existing project context...")
-                result = self.context_interface.process_request_with_context(
-                    request, 
-                    self.current_project
-                )
-                
-                if result.get('project_file'):
-                    self.current_project = result['project_file']
-                    
-                # Add context-aware suggestions
-                if result.get('status') == 'success':
-                    result['next_suggestions'] = self.context_interface.suggest_next_actions()
-                    
-                return result
-            
-            # For new projects, check if we should analyze context from templates
-            elif 'like' in request_lower or 'similar to' in request_lower:
-                # Analyze reference for context
-                print("Analyzing reference style for context...")
-                # This would analyze a reference track/style
-                pass
+        modification = self._modify_current_project(request)
+        if modification is not None:
+            return modification
         
         # Standard processing (original behavior)
         # Use GPT to enhance and clarify the request if needed
@@ -103,20 +108,7 @@ class GPT5MusicInterface:
             
             # Analyze what was created
             analysis = self._analyze_creation(project_file, enhanced_request)
-            
-            result.update({
-                "status": "success",
-                "project_file": project_file,
-                "analysis": analysis,
-                "instructions": f"Open {project_file} in LMMS to hear the music"
-            })
-            
-            # If context-aware, add suggestions
-            if self.context_aware and self.context_interface:
-                # Analyze the newly created project
-                context = self.context_interface.analyzer.analyze_project(project_file)
-                result['context_summary'] = self.context_interface._summarize_context(context)
-                result['next_suggestions'] = context.suggestions[:3] if context.suggestions else []
+            self._finish_creation(result, project_file, analysis)
             
             # Add to history
             self.session_history.append({"role": "assistant", "result": result})
@@ -129,16 +121,78 @@ class GPT5MusicInterface:
         
         return result
     
-    def _enhance_request(self, request: str) -> str:
+    def _is_modification(self, request: str) -> bool:
         """
-        Use GPT to enhance and clarify the musical request
+        Whether a request reads as a change to the current project
+        """
+        if not (self.context_aware and self.context_interface):
+            return False
+        request_lower = request.lower()
+        return any(word in request_lower for word in MODIFICATION_WORDS)
+    
+    def _modify_current_project(self, request: str) -> Optional[Dict[str, Any]]:
+        """
+        Apply a modification request to the current project with context awareness
+        Returns None when the request should create new music instead
         """
-        if not self.api_key:
-            return request
         
-        # Check if request needs enhancement
-        if len(request.split()) < 5:  # Short request, might need details
-            prompt = f"""
+        # Check if we should use context-aware processing
+        if self.context_aware and self.context_interface:
+            # Determine if this is a modification request or new creation
+            if self._is_modification(request) and self.current_project:
+                # Use context-aware processing for modifications
+                print("Analyzing existing project context...")
+                result = self.context_interface.process_request_with_context(
+                    request, 
+                    self.current_project
+                )
+                
+                if result.get('project_file'):
+                    self.current_project = result['project_file']
+                    
+                # Add context-aware suggestions
+                if result.get('status') == 'success':
+                    result['next_suggestions'] = self.context_interface.suggest_next_actions()
+                    
+                return result
+            
+            # For new projects, check if we should analyze context from templates
+            request_lower = request.lower()
+            if 'like' in request_lower or 'similar to' in request_lower:
+                # Analyze reference for context
+                print("Analyzing reference style for context...")
+                # This would analyze a reference track/style
+                pass
+        
+        return None
+    
+    def _finish_creation(self, result: Dict[str, Any], project_file: str, analysis: Dict[str, Any]):
+        """
+        Fill in the result of a successful creation
+        """
+        result.update({
+            "status": "success",
+            "project_file": project_file,
+            "analysis": analysis,
+            "instructions": f"Open {project_file} in LMMS to hear the music"
+        })
+        
+        # If context-aware, add suggestions
+        if self.context_aware and self.context_interface:
+            # Analyze the newly created project
+            context = self.context_interface.analyzer.analyze_project(project_file)
+            result['context_summary'] = self.context_interface._summarize_context(context)
+            result['next_suggestions'] = context.suggestions[:3] if context.suggestions else []
+    
+    def _enhance_messages(self, request: str, history: List[Dict[str, Any]]) -> Optional[List[Dict[str, str]]]:
+        """
+        Build the chat messages for enhancing a request, or None if it needs none
+        history is the recent session history given to GPT as context
+        """
+        if len(request.split()) >= 5:  # Long enough to be clear already
+            return None
+        
+        prompt = f"""
             The user wants to create music with this request: "{request}"
             
             Enhance this request with musical details while preserving the original intent.
@@ -151,28 +205,56 @@ class GPT5MusicInterface:
             Keep the enhanced request natural and musical.
             If the request is already clear and complete, return it as is.
             
-            Context from session: {json.dumps(self.session_history[-3:]) if len(self.session_history) > 0 else "New session"}
+            Context from session: {json.dumps(history) if history else "New session"}
             """
+        
+        return [
+            {"role": "system", "content": "You are a music production assistant who helps clarify musical requests."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _enhance_request(self, request: str) -> str:
+        """
+        Use GPT to enhance and clarify the musical request
+        """
+        if not self.api_key:
+            return request
+        
+        messages = self._enhance_messages(request, self.session_history[-3:])
+        if messages is None:
+            return request
+        
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-4",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=200
+            )
             
-            try:
-                response = openai.ChatCompletion.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "You are a music production assistant who helps clarify musical requests."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=200
-                )
-                
-                enhanced = response.choices[0].message.content.strip()
-                print(f"Enhanced request: {enhanced}")
-                return enhanced
-                
-            except:
-                return request
+            enhanced = response.choices[0].message.content.strip()
+            print(f"Enhanced request: {enhanced}")
+            return enhanced
+            
+        except:
+            return request
+    
+    def _analysis_messages(self, request: str) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for describing what was created
+        """
+        prompt = f"""
+            A music file was created based on this request: "{request}"
+            
+            Provide a brief, enthusiastic description of what was likely created,
+            mentioning the genre, mood, and key characteristics.
+            Keep it under 50 words.
+            """
         
-        return request
+        return [
+            {"role": "system", "content": "You are a music journalist describing new tracks."},
+            {"role": "user", "content": prompt}
+        ]
     
     def _analyze_creation(self, project_file: str, request: str) -> Dict[str, Any]:
         """
@@ -186,21 +268,10 @@ class GPT5MusicInterface:
         
         if self.api_key:
             # Use GPT to provide a description of what was created
-            prompt = f"""
-            A music file was created based on this request: "{request}"
-            
-            Provide a brief, enthusiastic description of what was likely created,
-            mentioning the genre, mood, and key characteristics.
-            Keep it under 50 words.
-            """
-            
             try:
-                response = openai.ChatCompletion.create(
+                response = self.client.chat.completions.create(
                     model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a music journalist describing new tracks."},
-                        {"role": "user", "content": prompt}
-                    ],
+                    messages=self._analysis_messages(request),
                     temperature=0.8,
                     max_tokens=100
                 )
@@ -212,19 +283,178 @@ class GPT5MusicInterface:
         
         return analysis
     
-    def process_batch_requests(self, requests: List[str]) -> List[Dict[str, Any]]:
+    async def _aenhance_request(self, request: str, history: List[Dict[str, Any]], complete) -> str:
         """
-        Process multiple musical requests
+        Async variant of _enhance_request
+        complete awaits one chat completion through the batch's shared client
         """
+        messages = self._enhance_messages(request, history)
+        if messages is None:
+            return request
+        
+        try:
+            response = await complete(
+                model="gpt-4",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=200
+            )
+            
+            enhanced = response.choices[0].message.content.strip()
+            print(f"Enhanced request: {enhanced}")
+            return enhanced
+            
+        except Exception:
+            return request
+    
+    async def _aanalyze_creation(self, project_file: str, request: str, complete) -> Dict[str, Any]:
+        """
+        Async variant of _analyze_creation
+        """
+        analysis = {
+            "created_file": project_file,
+            "request_fulfilled": True,
+            "description": "Music created based on your request"
+        }
+        
+        try:
+            response = await complete(
+                model="gpt-3.5-turbo",
+                messages=self._analysis_messages(request),
+                temperature=0.8,
+                max_tokens=100
+            )
+            
+            analysis["description"] = response.choices[0].message.content.strip()
+            
+        except Exception:
+            pass
+        
+        return analysis
+    
+    async def process_batch_requests_async(self, requests: List[str],
+                                           num_concurrent: int = BATCH_CONCURRENCY,
+                                           max_requests_per_minute: int = BATCH_REQUESTS_PER_MINUTE
+                                           ) -> List[Dict[str, Any]]:
+        """
+        Process multiple musical requests, overlapping their OpenAI calls
+        
+        Projects are still created and modified strictly in request order, so a
+        follow-up like "make it heavier" modifies the project made before it.
+        That work runs in a worker thread, one request at a time, while the GPT
+        calls proceed concurrently: enhancements are fetched up front, with the
+        session history from before the batch as context, and descriptions of
+        created projects are fetched while later requests are being created.
+        """
+        if not self.api_key:
+            # Without an API key no GPT calls are made, so there is nothing to overlap
+            results = []
+            for request in requests:
+                print(f"\nProcessing: {request}")
+                results.append(self.process_request(request))
+            return results
+        
+        loop = asyncio.get_running_loop()
+        limiter = TokenBucket(max_requests_per_minute)
+        semaphore = asyncio.Semaphore(num_concurrent)
+        history = self.session_history[-3:]
+        
         results = []
-        for request in requests:
-            print(f"\nProcessing: {request}")
-            result = self.process_request(request)
-            results.append(result)
-            time.sleep(1)  # Avoid overwhelming the system
+        created = []
+        analyses = []
+        
+        # One client for the whole batch, closed once every call is done
+        async with AsyncOpenAI(api_key=self.api_key) as client:
+            
+            async def complete(**kwargs):
+                async with semaphore:
+                    await limiter.acquire()
+                    return await client.chat.completions.create(**kwargs)
+            
+            # Enhance every request that may create music. Only modifications of a
+            # project that already exists are certain to need none; the rest are
+            # cancelled if they turn out to be modifications after all
+            enhancements = [
+                None if self.current_project and self._is_modification(request)
+                else asyncio.ensure_future(self._aenhance_request(request, history, complete))
+                for request in requests
+            ]
+            
+            try:
+                for request, enhancement in zip(requests, enhancements):
+                    print(f"\nProcessing: {request}")
+                    modification = await loop.run_in_executor(None, self._modify_current_project, request)
+                    if modification is not None:
+                        if enhancement is not None:
+                            enhancement.cancel()
+                        results.append(modification)
+                        created.append(False)
+                        continue
+                    
+                    if enhancement is None:
+                        enhanced_request = await self._aenhance_request(request, history, complete)
+                    else:
+                        enhanced_request = await enhancement
+                    
+                    result = {
+                        "original_request": request,
+                        "enhanced_request": enhanced_request,
+                        "status": "processing"
+                    }
+                    results.append(result)
+                    created.append(True)
+                    
+                    try:
+                        project_file = await loop.run_in_executor(None, self.brain.create_music, enhanced_request)
+                        self.current_project = project_file
+                    except Exception as e:
+                        result.update({
+                            "status": "error",
+                            "error": str(e)
+                        })
+                        continue
+                    
+                    analyses.append((result, project_file, asyncio.ensure_future(
+                        self._aanalyze_creation(project_file, enhanced_request, complete))))
+                
+                await asyncio.gather(*(task for _, _, task in analyses), return_exceptions=True)
+                
+            finally:
+                # Nothing may outlive the client if a request raised
+                for task in enhancements + [task for _, _, task in analyses]:
+                    if task is not None:
+                        task.cancel()
+        
+        for result, project_file, task in analyses:
+            try:
+                self._finish_creation(result, project_file, task.result())
+            except Exception as e:
+                result.update({
+                    "status": "error",
+                    "error": str(e)
+                })
+        
+        # Record the batch in the session history in request order
+        for request, result, is_creation in zip(requests, results, created):
+            self.session_history.append({"role": "user", "request": request})
+            if is_creation and result["status"] == "success":
+                self.session_history.append({"role": "assistant", "result": result})
         
         return results
     
+    def process_batch_requests(self, requests: List[str]) -> List[Dict[str, Any]]:
+        """
+        Process multiple musical requests
+        Must not be called from a running event loop; await
+        process_batch_requests_async there instead
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.process_batch_requests_async(requests))
+        raise RuntimeError("process_batch_requests called inside a running event loop; "
+                           "await process_batch_requests_async instead")
+    
     def preview_changes(self, request: str) -> Dict[str, Any]:
         """
         Preview what changes would be made without applying them
@@ -290,7 +520,7 @@ class GPT5MusicInterface:
         """
         
         try:
-            response = openai.ChatCompletion.create(
+            response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a creative music producer suggesting variations."},
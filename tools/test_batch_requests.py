@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test batch processing in the GPT-5 music interface
+Runs the async batch path against a stub OpenAI client, so no API key is needed
+"""
+
+import os
+import sys
+import time
+import asyncio
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import gpt5_music_interface
+from gpt5_music_interface import GPT5MusicInterface
+
+
+class StubAsyncOpenAI:
+    """
+    Stands in for openai.AsyncOpenAI
+    Every chat completion takes `latency` seconds; calls in flight are tracked
+    """
+
+    latency = 0.3
+
+    def __init__(self, api_key=None):
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        StubAsyncOpenAI.last = self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def _create(self, model, messages, **kwargs):
+        self.calls.append(model)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+
+        content = "dark minimal techno at 130 BPM" if model == "gpt-4" else "A pounding warehouse track."
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def stub_interface() -> GPT5MusicInterface:
+    """Context-aware interface whose batch calls go to StubAsyncOpenAI"""
+    gpt5_music_interface.AsyncOpenAI = StubAsyncOpenAI
+    interface = GPT5MusicInterface(context_aware=True)
+    interface.api_key = "stub-key"  # The stub replaces the client, so any key works
+    return interface
+
+
+def remove_projects(results):
+    """Delete the project files a batch wrote"""
+    for result in results:
+        if result.get('project_file') and os.path.exists(result['project_file']):
+            os.remove(result['project_file'])
+
+
+def test_batch_keeps_request_order():
+    """A follow-up in the same batch modifies the project created before it"""
+
+    print("\n" + "="*70)
+    print("TESTING BATCH REQUEST ORDER")
+    print("="*70)
+
+    interface = stub_interface()
+    requests = ["techno", "make it heavier", "ambient"]
+    results = interface.process_batch_requests(requests)
+
+    try:
+        assert [r.get('original_request', r.get('request')) for r in results] == requests
+
+        # The follow-up went through context-aware modification, not creation
+        assert 'enhanced_request' in results[0] and 'enhanced_request' in results[2]
+        assert 'context_before' in results[1] and 'enhanced_request' not in results[1]
+
+        # Only the two creations were described. The follow-up may have been
+        # enhanced speculatively, since no project existed when the batch began
+        assert StubAsyncOpenAI.last.calls.count('gpt-3.5-turbo') == 2
+
+        # Session history reads as if the requests had been made one by one
+        roles = [(entry['role'], entry.get('request')) for entry in interface.session_history]
+        expected = [('user', 'techno'), ('user', 'make it heavier'), ('user', 'ambient')]
+        if results[0]['status'] == 'success':
+            expected.insert(1, ('assistant', None))
+        if results[2]['status'] == 'success':
+            expected.append(('assistant', None))
+        assert roles == expected, roles
+
+        print("Requests processed in order; follow-up modified the first project")
+    finally:
+        remove_projects(results)
+
+
+def test_batch_overlaps_gpt_calls():
+    """GPT calls for different requests are in flight at the same time"""
+
+    print("\n" + "="*70)
+    print("TESTING BATCH CONCURRENCY")
+    print("="*70)
+
+    interface = stub_interface()
+    requests = ["dark techno", "deep house", "ambient pads", "trap beat"]
+
+    start = time.time()
+    results = interface.process_batch_requests(requests)
+    elapsed = time.time() - start
+
+    try:
+        stub = StubAsyncOpenAI.last
+        serial = len(stub.calls) * StubAsyncOpenAI.latency
+        print(f"{len(stub.calls)} GPT calls, at most {stub.max_in_flight} in flight")
+        print(f"Batch took {elapsed:.2f}s; the calls alone take {serial:.2f}s back to back")
+
+        assert len(stub.calls) == 2 * len(requests)
+        assert stub.max_in_flight >= len(requests)
+    finally:
+        remove_projects(results)
+
+
+def test_batch_inside_event_loop():
+    """The sync wrapper refuses to nest event loops"""
+
+    print("\n" + "="*70)
+    print("TESTING BATCH INSIDE AN EVENT LOOP")
+    print("="*70)
+
+    interface = stub_interface()
+
+    async def call_sync_wrapper():
+        try:
+            interface.process_batch_requests(["techno"])
+        except RuntimeError as e:
+            return str(e)
+        return None
+
+    message = asyncio.run(call_sync_wrapper())
+    assert message and 'process_batch_requests_async' in message
+    print(f"Raised as expected: {message}")
+
+
+if __name__ == "__main__":
+    print("\nGPT-5 MUSIC INTERFACE BATCH TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_batch_keeps_request_order()
+        test_batch_overlaps_gpt_calls()
+        test_batch_inside_event_loop()
+
+        print("\n" + "="*70)
+        print("ALL TESTS PASSED")
+        print("="*70)
+
+    except Exception as e:
+        print(f"\nTest failed: {e}")
+        import traceback
+        traceback.print_exc()